@@ -33,6 +33,11 @@ from typing import Optional, Callable
 import ipywidgets as widgets
 from IPython.display import display, HTML
 
+from .nbstrip import install_filter, bytes_saved
+from .gitdir import git_path
+from .lint import CACHE_NAME as LINT_CACHE_NAME, LintEngine, load_config, staged_sources, to_json
+from .scaffold import Scaffold
+
 try:
     from google.colab.userdata import get as get_secret
     WORKING_PATH: Path = Path('/').joinpath('content').resolve()
@@ -44,6 +49,7 @@ except:
     REPOSITORY_PATH: Path = Path('.').joinpath('my_repository').resolve()
 
 WORKFLOW_DIR = REPOSITORY_PATH / '.github' / 'workflows'
+LINT_REPORT_NAME = 'lint_report.json'
 CURRENT_DIR = Path(__file__).parent / 'workflows'
 
 
@@ -366,8 +372,10 @@ class GitHubLazy:
                                         tooltip="Fetches changes from a remote repository and merges them into the local branch. This is used to update the local code with changes from others.")
         self.push_button = CustomButton(description='Push', button_style='warning', callback=self.push,
                                         tooltip="Updates the remote repository with any commits made locally to a branch. It's a way to share your changes with others.")
+        self.scaffold_button = CustomButton(description='Scaffold', button_style='info', callback=self.scaffold,
+                                            tooltip="Creates the missing setup.py, .readthedocs.yml and Sphinx configuration files from the repository name and the author secrets. Existing files are never overwritten.")
 
-        self.github_button_layout = widgets.HBox([self.status_button, self.pull_button, self.push_button],
+        self.github_button_layout = widgets.HBox([self.status_button, self.pull_button, self.push_button, self.scaffold_button],
                                                  layout=widgets.Layout(justify_content='flex-start', width='100%'))
 
         yml_files = []
@@ -433,7 +441,8 @@ class GitHubLazy:
         """Clone a GitHub repository.
 
         This method is designed to clone a GitHub repository using the repository URL provided through
-        the clone_layout text widget interface.
+        the clone_layout text widget interface. The notebook output stripping filter is installed
+        in the new repository, see `gcpds.docs.nbstrip`.
 
         Parameters
         ----------
@@ -460,6 +469,8 @@ class GitHubLazy:
         self.run_command('git config pull.rebase true', silent=True)
         self.run_command(
             'git config --global credential.helper cache', silent=True)
+        if REPOSITORY_PATH.exists():
+            install_filter(REPOSITORY_PATH)
         sys.path.append(REPOSITORY_PATH)
 
     # ----------------------------------------------------------------------
@@ -467,7 +478,11 @@ class GitHubLazy:
         """Commit changes to the local repository with a message.
 
         The commit message is provided through the commit_layout's text widget.
-        This allows users to specify what changes they're committing.
+        This allows users to specify what changes they're committing. The bytes removed from the
+        staged notebooks by the output stripping filter are reported in the logger, and the staged
+        content of the Python files is checked in the kernel process with `gcpds.docs.lint` as a
+        non-blocking pre-commit hook: the report is written next to the lint cache in the git
+        directory, and a failure of these checks is logged without stopping the commit.
 
         Parameters
         ----------
@@ -490,9 +505,27 @@ class GitHubLazy:
 
         self.run_command("git add .", path=REPOSITORY_PATH)
         self.run_command("git add -f .github", path=REPOSITORY_PATH)
+        saved, violations, failure = 0, [], None
+        try:
+            report = git_path(REPOSITORY_PATH, LINT_REPORT_NAME)
+            saved = sum(bytes_saved(REPOSITORY_PATH).values())
+            violations = LintEngine(git_path(REPOSITORY_PATH, LINT_CACHE_NAME), workers=1,
+                                    **load_config(REPOSITORY_PATH)).run_sources(
+                staged_sources(REPOSITORY_PATH))
+            report.write_text(to_json(violations))
+        except Exception as error:
+            failure = f'{type(error).__name__}: {error}'
+            logging.warning(f'Pre-commit checks failed: {failure}')
+
         self.run_command(
             f"git commit -m '{self.commit_layout.text.strip()}'", path=REPOSITORY_PATH)
         self.commit_layout.text = ''
+        if failure:
+            self.logger.value += f'\nPre-commit checks skipped: {failure}'
+        if saved:
+            self.logger.value += f'\nNotebook outputs stripped: {saved} bytes saved'
+        if violations:
+            self.logger.value += f'\nBest practices lint: {len(violations)} issues, see {report}'
 
     # ----------------------------------------------------------------------
     def pull(self, evt: Optional[widgets.Button] = None) -> None:
@@ -549,6 +582,38 @@ class GitHubLazy:
 
         self.run_command("git push", path=REPOSITORY_PATH)
 
+    # ----------------------------------------------------------------------
+    def scaffold(self, evt: Optional[widgets.Button] = None) -> None:
+        """Creates the packaging and documentation files missing in the local repository.
+
+        The module and submodule are inferred from the `python-<module>.<submodule>` repository
+        name, and the author from the GitHub secrets. See `gcpds.docs.scaffold`. Nothing is
+        written when the repository is not cloned, has no `origin` remote or the secrets are
+        unset, the reason is shown in the logger instead.
+
+        Parameters
+        ----------
+        evt : Optional[widgets.Button], optional
+            The button event that triggers this method. If the method is called programmatically without a button event, this argument should be None. Default is None.
+        """
+
+        if not REPOSITORY_PATH.exists():
+            self.logger.value = f'No repository cloned in {REPOSITORY_PATH}, clone it first.'
+            return
+        if not (self.GITHUB_NAME and self.GITHUB_EMAIL):
+            self.logger.value = 'The GITHUB_NAME and GITHUB_EMAIL secrets are required.'
+            return
+
+        try:
+            scaffold = Scaffold.from_repository(
+                REPOSITORY_PATH, self.GITHUB_NAME, self.GITHUB_EMAIL)
+        except ValueError as error:
+            self.logger.value = str(error)
+            return
+        status = scaffold.write(REPOSITORY_PATH)
+        self.logger.value = '\n'.join(
+            f'{state}: {filename}' for filename, state in status.items())
+
     # ----------------------------------------------------------------------
     def copy_workflow(self, workflow: Path) -> None:
         """Copies the specified GitHub Actions workflow file to the repository's workflow directory.
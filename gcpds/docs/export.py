@@ -0,0 +1,426 @@
+"""
+=====================================
+Incremental Notebook Module Exporter
+=====================================
+
+This module moves tagged code cells from Jupyter notebooks into Python modules, following
+the `03_python_module` workflow. Each exported cell becomes a block in its target module,
+enclosed between a ``# export: <notebook>#<cell>`` marker and a ``# end export`` marker, so
+exported and hand-written code can share a module. A per-cell hash index records what was
+exported, so a new export only rewrites the blocks of the cells that changed and leaves
+every other module, and every line outside the blocks, untouched.
+
+Cells are selected with Jupyter cell tags:
+
+- ``export``: the cell goes to the exporter's default target module.
+- ``export:<path>``: the cell goes to ``<path>``, relative to the repository root, e.g.
+  ``export:gcpds/submodule/optional_file_1.py``.
+
+Subsections
+-----------
+- Blocks:
+    Parsing and splicing of the marker delimited blocks inside a module.
+- NotebookExporter:
+    The exporter with its hash index and the polling or inotify based watcher.
+
+"""
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    from .gitdir import git_path
+except ImportError:
+    from gitdir import git_path
+
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+
+EXPORT_TAG: str = 'export'
+MARKER: str = '# export: '
+END_MARKER: str = '# end export'
+INDEX_NAME: str = 'export_index.json'
+
+
+# ----------------------------------------------------------------------
+def parse_blocks(text: str) -> List[Union[str, Tuple[str, str]]]:
+    """Split a module into hand-written text and exported blocks.
+
+    A block spans from its ``# export: <key>`` marker to the next ``# end export`` line.
+    A block without a closing marker, as written by earlier versions, ends at the next
+    export marker or at the end of the file.
+
+    Parameters
+    ----------
+    text : str
+        The module source.
+
+    Returns
+    -------
+    List[Union[str, Tuple[str, str]]]
+        The module segments in file order: strings for the text outside the blocks and
+        ``(key, source)`` tuples for the blocks, where `key` is the ``<notebook>#<cell>``
+        identifier written in the marker.
+
+    """
+    segments, key, lines = [], None, []
+    for line in text.splitlines(keepends=True):
+        if line.startswith(MARKER):
+            if key is not None:
+                segments.append((key, ''.join(lines).strip('\n')))
+            elif lines:
+                segments.append(''.join(lines))
+            key, lines = line[len(MARKER):].strip(), []
+        elif key is not None and line.rstrip() == END_MARKER:
+            segments.append((key, ''.join(lines).strip('\n')))
+            key, lines = None, []
+        else:
+            lines.append(line)
+
+    if key is not None:
+        segments.append((key, ''.join(lines).strip('\n')))
+    elif lines:
+        segments.append(''.join(lines))
+    return segments
+
+
+# ----------------------------------------------------------------------
+def render_blocks(segments: List[Union[str, Tuple[str, str]]]) -> str:
+    """Join text segments and ``(key, source)`` blocks back into a module.
+
+    Parameters
+    ----------
+    segments : List[Union[str, Tuple[str, str]]]
+        The module segments, as returned by `parse_blocks`.
+
+    Returns
+    -------
+    str
+        The module source, ending with a single newline. Hand-written text is kept
+        verbatim, except for trailing blank lines at the end of the module.
+
+    """
+    text = ''.join(segment if isinstance(segment, str)
+                   else f'{MARKER}{segment[0]}\n{segment[1]}\n{END_MARKER}\n'
+                   for segment in segments)
+    return text.rstrip('\n') + '\n' if text.strip() else ''
+
+
+# ----------------------------------------------------------------------
+def splice_blocks(segments: List[Union[str, Tuple[str, str]]], notebook: str,
+                  cells: List[Tuple[str, str]]) -> List[Union[str, Tuple[str, str]]]:
+    """Replace the blocks exported from one notebook, keeping everything else in place.
+
+    Parameters
+    ----------
+    segments : List[Union[str, Tuple[str, str]]]
+        The module segments, as returned by `parse_blocks`.
+    notebook : str
+        The notebook identifier, blocks whose key starts with ``<notebook>#`` belong to it.
+    cells : List[Tuple[str, str]]
+        The ``(key, source)`` blocks the notebook exports to this module, in notebook order.
+
+    Returns
+    -------
+    List[Union[str, Tuple[str, str]]]
+        The updated segments. Only the text between the markers of the notebook's blocks
+        changes: removed cells are dropped together with the blank lines that separated
+        them from the previous segment, or from the next one when they come first, and new
+        cells are inserted after the preceding cell of the same notebook, or appended.
+
+    """
+    prefix = f'{notebook}#'
+    wanted = dict(cells)
+    spliced, removed = [], False
+    for segment in segments:
+        if isinstance(segment, str):
+            if not (removed and not segment.strip()):
+                spliced.append(segment)
+            removed = False
+            continue
+        key, source = segment
+        removed = key.startswith(prefix) and key not in wanted
+        if not removed:
+            spliced.append((key, wanted.get(key, source)))
+        elif spliced and isinstance(spliced[-1], str) and not spliced[-1].strip():
+            spliced.pop()
+            removed = False
+
+    previous = None
+    for key, source in cells:
+        keys = [segment[0] if isinstance(segment, tuple) else None for segment in spliced]
+        if key not in keys:
+            if previous in keys:
+                at = keys.index(previous) + 1
+                spliced[at:at] = ['\n\n', (key, source)]
+            else:
+                if spliced:
+                    last = spliced.pop() if isinstance(spliced[-1], str) else ''
+                    if last.strip():
+                        spliced.append(last.rstrip('\n') + '\n')
+                    spliced.append('\n\n')
+                spliced.append((key, source))
+        previous = key
+    return spliced
+
+
+# ----------------------------------------------------------------------
+def strip_magics(source: str) -> str:
+    """Drop the IPython line magics and shell escapes of a code cell.
+
+    A line starting with ``%`` or ``!`` is only dropped when it starts a statement, lines
+    continuing a bracket, a backslash or a triple-quoted string are Python code.
+
+    Parameters
+    ----------
+    source : str
+        The cell source.
+
+    Returns
+    -------
+    str
+        The source without magics, with trailing whitespace removed from every line.
+
+    """
+    lines, depth, quote, continued = [], 0, None, False
+    for line in source.splitlines():
+        if not (depth or quote or continued) and line.lstrip().startswith(('%', '!')):
+            continue
+        lines.append(line.rstrip())
+
+        i, comment = 0, False
+        while i < len(line):
+            if quote:
+                if line[i] == '\\':
+                    i += 1
+                elif line.startswith(quote, i):
+                    i, quote = i + len(quote) - 1, None
+            elif line[i] == '#':
+                comment = True
+                break
+            elif line[i] in '\'"':
+                quote = line[i:i + 3] if line[i:i + 3] in ('"""', "'''") else line[i]
+                i += len(quote) - 1
+            elif line[i] in '([{':
+                depth += 1
+            elif line[i] in ')]}':
+                depth = max(depth - 1, 0)
+            i += 1
+
+        continued = not comment and line.rstrip().endswith('\\')
+        if quote in ('"', "'") and not continued:
+            quote = None
+    return '\n'.join(lines).strip('\n')
+
+
+########################################################################
+class NotebookExporter:
+    """Export tagged notebook cells into modules, rewriting only what changed.
+
+    Parameters
+    ----------
+    root : Path
+        The repository root, export targets are relative to it.
+    default_target : Optional[str], optional
+        The module for cells tagged with a bare ``export``, e.g. ``gcpds/submodule/__init__.py``.
+        Cells with a bare tag are skipped when it is not set. Default is None.
+    index : Optional[Path], optional
+        The JSON file holding the per-cell hash index. Default is ``export_index.json``
+        in the repository's git directory, see `gcpds.docs.gitdir`.
+
+    Attributes
+    ----------
+    state : dict
+        The hash index, mapping each notebook to its stat signature and exported cells.
+
+    Examples
+    --------
+    >>> exporter = NotebookExporter('.', default_target='gcpds/submodule/__init__.py')
+    >>> exporter.export('notebooks/research.ipynb')
+    [PosixPath('gcpds/submodule/__init__.py')]
+
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, root: Path, default_target: Optional[str] = None,
+                 index: Optional[Path] = None):
+        """Initialize the exporter and load the hash index if it exists."""
+        self.root = Path(root)
+        self.default_target = default_target
+        self.index = Path(index) if index else git_path(self.root, INDEX_NAME)
+        self.state: dict = json.loads(
+            self.index.read_text()) if self.index.exists() else {}
+
+    # ----------------------------------------------------------------------
+    def _notebook_key(self, notebook: Path) -> str:
+        """Identify a notebook by its path relative to the root, when possible."""
+        notebook = Path(notebook).resolve()
+        try:
+            return notebook.relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return notebook.as_posix()
+
+    # ----------------------------------------------------------------------
+    def _target(self, tags: Iterable[str]) -> Optional[str]:
+        """Resolve the target module of a cell from its tags."""
+        for tag in tags:
+            if tag == EXPORT_TAG:
+                return self.default_target
+            if tag.startswith(f'{EXPORT_TAG}:'):
+                return tag[len(EXPORT_TAG) + 1:]
+        return None
+
+    # ----------------------------------------------------------------------
+    def cells(self, notebook: Path) -> Dict[str, dict]:
+        """Collect the exportable cells of a notebook.
+
+        Parameters
+        ----------
+        notebook : Path
+            The notebook to read.
+
+        Returns
+        -------
+        Dict[str, dict]
+            The cells in notebook order, keyed by ``<notebook>#<cell id>``, each with its
+            ``target``, ``source`` and ``hash``. Cells starting with a ``%%`` cell magic are
+            skipped, and line magics and shell escapes are dropped, see `strip_magics`.
+
+        """
+        name = self._notebook_key(notebook)
+        with open(notebook, encoding='utf-8') as file:
+            content = json.load(file)
+
+        cells = {}
+        for i, cell in enumerate(content.get('cells', [])):
+            if cell.get('cell_type') != 'code':
+                continue
+            target = self._target(cell.get('metadata', {}).get('tags', []))
+            if not target:
+                continue
+            source = cell.get('source', '')
+            if isinstance(source, list):
+                source = ''.join(source)
+            if source.lstrip().startswith('%%'):
+                continue
+            source = strip_magics(source)
+            cells[f"{name}#{cell.get('id', f'cell-{i}')}"] = {
+                'target': target,
+                'source': source,
+                'hash': hashlib.sha1(f'{target}\0{source}'.encode()).hexdigest(),
+            }
+        return cells
+
+    # ----------------------------------------------------------------------
+    def export(self, notebook: Path, force: bool = False) -> List[Path]:
+        """Synchronize the modules fed by a notebook.
+
+        Only the modules that receive a new, changed or removed cell are rewritten, and in
+        them only the affected blocks are replaced.
+
+        Parameters
+        ----------
+        notebook : Path
+            The notebook to export.
+        force : bool, optional
+            If True, ignore the hash index and splice every cell again. Default is False.
+
+        Returns
+        -------
+        List[Path]
+            The modules that were written.
+
+        """
+        name = self._notebook_key(notebook)
+        stat = os.stat(notebook)
+        previous = {} if force else self.state.get(name, {}).get('cells', {})
+        current = self.cells(notebook)
+
+        changed = {key: cell for key, cell in current.items()
+                   if previous.get(key, {}).get('hash') != cell['hash']
+                   or not (self.root / cell['target']).exists()}
+        targets = {cell['target'] for cell in changed.values()}
+        targets |= {cell['target'] for key, cell in previous.items()
+                    if key not in current or current[key]['target'] != cell['target']}
+
+        written = []
+        for target in sorted(targets):
+            path = self.root / target
+            text = path.read_text(encoding='utf-8') if path.exists() else ''
+            segments = splice_blocks(parse_blocks(text), name, [(key, cell['source']) for key, cell in current.items()
+                                                                if cell['target'] == target])
+            rendered = render_blocks(segments)
+            if rendered != text:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(rendered, encoding='utf-8')
+                written.append(path)
+
+        self.state[name] = {
+            'signature': [stat.st_mtime_ns, stat.st_size],
+            'cells': {key: {'target': cell['target'], 'hash': cell['hash']}
+                      for key, cell in current.items()},
+        }
+        if written or previous != self.state[name]['cells']:
+            self.index.write_text(json.dumps(self.state, indent=1, sort_keys=True))
+        return written
+
+    # ----------------------------------------------------------------------
+    def changed(self, notebook: Path) -> bool:
+        """Check, from its size and modification time only, if a notebook needs an export."""
+        stat = os.stat(notebook)
+        signature = self.state.get(self._notebook_key(notebook), {}).get('signature')
+        return signature != [stat.st_mtime_ns, stat.st_size]
+
+    # ----------------------------------------------------------------------
+    def watch(self, notebooks: Iterable[Path], interval: float = 0.5,
+              callback: Optional[Callable[[Path, List[Path]], None]] = None,
+              inotify: bool = True) -> None:
+        """Export notebooks every time they are saved, until interrupted.
+
+        Parameters
+        ----------
+        notebooks : Iterable[Path]
+            The notebooks to watch.
+        interval : float, optional
+            Seconds between polls, or the inotify read timeout. Default is 0.5.
+        callback : Optional[Callable[[Path, List[Path]], None]], optional
+            Called with each exported notebook and the modules written. Default is None.
+        inotify : bool, optional
+            Use inotify when `inotify_simple` is installed, otherwise poll the notebooks'
+            size and modification time. Default is True.
+
+        """
+        notebooks = [Path(notebook) for notebook in notebooks]
+
+        def sync(notebook: Path) -> None:
+            if notebook.exists() and self.changed(notebook):
+                written = self.export(notebook)
+                if callback:
+                    callback(notebook, written)
+
+        for notebook in notebooks:
+            sync(notebook)
+
+        if inotify and INotify is not None:
+            watcher = INotify()
+            directories = {}
+            for notebook in notebooks:
+                wd = watcher.add_watch(str(notebook.parent),
+                                       flags.CLOSE_WRITE | flags.MOVED_TO)
+                directories.setdefault(wd, {})[notebook.name] = notebook
+            while True:
+                for event in watcher.read(timeout=int(interval * 1000)):
+                    notebook = directories.get(event.wd, {}).get(event.name)
+                    if notebook:
+                        sync(notebook)
+        else:
+            while True:
+                time.sleep(interval)
+                for notebook in notebooks:
+                    sync(notebook)
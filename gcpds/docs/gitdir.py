@@ -0,0 +1,44 @@
+"""
+=================================
+Git Directory Files
+=================================
+
+This module resolves the files that the tools of `gcpds.docs` keep inside the git
+directory of a repository: caches, indexes, reports and ``info/attributes``. Files there
+belong to the local clone and are never picked up by ``git add .``.
+
+Notes
+-----
+Only the standard library is used, and this file must remain importable without the rest
+of the package, as ``nbstrip.py``, ``lint.py`` and ``linkcheck.py`` are also run as
+standalone scripts.
+
+"""
+
+import subprocess
+from pathlib import Path
+
+
+# ----------------------------------------------------------------------
+def git_path(root: Path, name: str) -> Path:
+    """Resolve a file inside the git directory of a repository.
+
+    The path is asked to ``git rev-parse --git-path``, so it is also correct for worktrees
+    and submodules, where ``.git`` is a file instead of a directory.
+
+    Parameters
+    ----------
+    root : Path
+        The repository root, or any directory inside the working tree.
+    name : str
+        The file name relative to the git directory, e.g. ``'info/attributes'``.
+
+    Returns
+    -------
+    Path
+        ``<git dir>/<name>``, or ``<root>/.<name>`` outside a git repository.
+
+    """
+    path = subprocess.run(['git', 'rev-parse', '--git-path', name], cwd=root, stdout=subprocess.PIPE,
+                          stderr=subprocess.DEVNULL, text=True).stdout.strip()
+    return Path(root) / path if path else Path(root) / f'.{name}'
@@ -0,0 +1,490 @@
+"""
+=================================
+Concurrent and Cached Link Check
+=================================
+
+This module checks the external links of the documentation sources, the markdown cells
+of ``.ipynb`` notebooks and ``.rst`` files. Links are checked with asyncio over pooled
+keep-alive connections, with a global and a per-host concurrency limit, and every result
+is stored in an on-disk cache with a time to live. A rerun only checks the links that are
+new or whose cached result expired.
+
+Only the standard library is used: requests are plain HTTP/1.1 over
+``asyncio.open_connection``, so the checker works against any server, including a local
+``http.server`` stand-in. In Jupyter or Colab, where an event loop is already running,
+prefer ``await checker.check_async(urls)``; the synchronous `LinkChecker.check` and
+`LinkChecker.run` fall back to a worker thread there.
+
+Subsections
+-----------
+- Extraction:
+    Collect links from notebooks and reStructuredText sources.
+- Connection Pool:
+    A minimal HTTP/1.1 client reusing connections per host.
+- LinkChecker:
+    The concurrent checker with its result cache.
+- Command Line:
+    A standalone entry point, ``python linkcheck.py docs/source``.
+
+"""
+
+import re
+import ssl
+import sys
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
+from urllib.parse import urljoin, urlsplit, urldefrag
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+try:
+    from .gitdir import git_path
+except ImportError:
+    from gitdir import git_path
+
+CACHE_NAME: str = 'linkcheck_cache.json'
+USER_AGENT: str = 'gcpds-docs-linkcheck'
+MAX_REDIRECTS: int = 5
+REDIRECT_STATUS: tuple = (301, 302, 303, 307, 308)
+
+_URL = re.compile(r'https?://[^\s<>"\'`()\[\]{}]+')
+_CODE = re.compile(r'```.*?```|`[^`\n]*`', re.DOTALL)
+_RST_LINK = re.compile(r'`[^`<]*<(https?://[^>]+)>`_')
+
+
+########################################################################
+class Link(NamedTuple):
+    """A link found in a documentation source.
+
+    Attributes
+    ----------
+    url : str
+        The link target.
+    source : str
+        The file containing the link.
+    location : str
+        The line, or the cell and line for notebooks.
+
+    """
+
+    url: str
+    source: str
+    location: str
+
+
+########################################################################
+class LinkResult(NamedTuple):
+    """The outcome of checking a URL.
+
+    Attributes
+    ----------
+    url : str
+        The checked URL, without fragment.
+    ok : bool
+        True when the final response, after redirects, has a 2xx status.
+    status : Optional[int]
+        The final HTTP status, None when no response was received.
+    error : str
+        The failure reason, empty when `ok`.
+    checked : float
+        The check timestamp, in seconds since the epoch.
+
+    """
+
+    url: str
+    ok: bool
+    status: Optional[int]
+    error: str
+    checked: float
+
+
+# ----------------------------------------------------------------------
+def _urls(text: str) -> Iterable[Tuple[str, int]]:
+    """Yield the URLs in a text with their 1-based line numbers."""
+    for number, line in enumerate(text.splitlines(), 1):
+        for url in _RST_LINK.findall(line) + _URL.findall(_RST_LINK.sub('', line)):
+            yield url.rstrip('.,;:!?*_'), number
+
+
+# ----------------------------------------------------------------------
+def extract_links(path: Path) -> List[Link]:
+    """Collect the external links of a notebook or reStructuredText file.
+
+    In notebooks only markdown and raw cells are read, and code spans and fenced code
+    blocks are left out, since their URLs are usually examples or placeholders.
+
+    Parameters
+    ----------
+    path : Path
+        An ``.ipynb`` or ``.rst`` file.
+
+    Returns
+    -------
+    List[Link]
+        The links in file order.
+
+    """
+    path = Path(path)
+    if path.suffix != '.ipynb':
+        return [Link(url, str(path), str(line)) for url, line in _urls(path.read_text(encoding='utf-8'))]
+
+    with open(path, encoding='utf-8') as file:
+        cells = json.load(file).get('cells', [])
+    links = []
+    for i, cell in enumerate(cells, 1):
+        if cell.get('cell_type') not in ('markdown', 'raw'):
+            continue
+        source = cell.get('source', '')
+        source = ''.join(source) if isinstance(source, list) else source
+        source = _CODE.sub(lambda match: '\n' * match.group().count('\n'), source)
+        links.extend(Link(url, str(path), f'cell {i}, line {line}')
+                     for url, line in _urls(source))
+    return links
+
+
+########################################################################
+class ConnectionPool:
+    """Reuse keep-alive HTTP/1.1 connections per scheme, host and port.
+
+    Parameters
+    ----------
+    timeout : float
+        Seconds allowed for each request, connection included.
+    ssl_context : Optional[ssl.SSLContext], optional
+        The context for ``https`` URLs. Default is ``ssl.create_default_context()``.
+
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, timeout: float, ssl_context: Optional[ssl.SSLContext] = None):
+        """Initialize an empty pool."""
+        self.timeout = timeout
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.idle: Dict[tuple, list] = defaultdict(list)
+        self.opened: int = 0
+
+    # ----------------------------------------------------------------------
+    async def _connect(self, key: tuple) -> tuple:
+        """Take an idle connection for `key` or open a new one."""
+        while self.idle[key]:
+            reader, writer = self.idle[key].pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+        scheme, host, port = key
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=self.ssl_context if scheme == 'https' else None)
+        self.opened += 1
+        return reader, writer, False
+
+    # ----------------------------------------------------------------------
+    async def _exchange(self, method: str, url: str) -> Tuple[int, Dict[str, str]]:
+        """Send one request and read the response head, releasing the connection."""
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+        target = parts.path or '/'
+        if parts.query:
+            target += f'?{parts.query}'
+        request = (f'{method} {target} HTTP/1.1\r\nHost: {parts.netloc}\r\n'
+                   f'User-Agent: {USER_AGENT}\r\nAccept: */*\r\nConnection: keep-alive\r\n\r\n')
+
+        reader, writer, reused = await self._connect(key)
+        try:
+            writer.write(request.encode('latin-1'))
+            await writer.drain()
+            head = await reader.readuntil(b'\r\n\r\n')
+        except (ConnectionError, asyncio.IncompleteReadError):
+            writer.close()
+            if not reused:
+                raise
+            return await self._exchange(method, url)
+        except asyncio.CancelledError:
+            writer.close()
+            raise
+
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split()[1])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        reusable = (method == 'HEAD' or status in (204, 304)
+                    or headers.get('content-length') == '0')
+        if reusable and headers.get('connection', '').lower() != 'close':
+            self.idle[key].append((reader, writer))
+        else:
+            writer.close()
+        return status, headers
+
+    # ----------------------------------------------------------------------
+    async def request(self, method: str, url: str) -> Tuple[int, Dict[str, str]]:
+        """Send a request and return the status and lowercased headers.
+
+        Parameters
+        ----------
+        method : str
+            ``'HEAD'`` or ``'GET'``. Bodies are never read, connections that would carry
+            one are closed instead of returned to the pool.
+        url : str
+            An absolute ``http`` or ``https`` URL.
+
+        Returns
+        -------
+        Tuple[int, Dict[str, str]]
+            The status code and the response headers.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If the request takes longer than `timeout`.
+        OSError
+            If the connection fails.
+
+        """
+        return await asyncio.wait_for(self._exchange(method, url), self.timeout)
+
+    # ----------------------------------------------------------------------
+    def close(self) -> None:
+        """Close every idle connection."""
+        for connections in self.idle.values():
+            for _, writer in connections:
+                writer.close()
+        self.idle.clear()
+
+
+########################################################################
+class LinkChecker:
+    """Check URLs concurrently, caching the results on disk with a time to live.
+
+    Parameters
+    ----------
+    cache : Optional[Path], optional
+        The JSON file holding the results. Default is None, no cache.
+    ok_ttl : float, optional
+        Seconds a working link stays cached. Default is one week.
+    broken_ttl : float, optional
+        Seconds a broken link stays cached. Default is one hour.
+    concurrency : int, optional
+        The maximum number of requests in flight. Default is 32.
+    per_host : int, optional
+        The maximum number of requests in flight to the same host. Default is 4.
+    timeout : float, optional
+        Seconds allowed for each request. Default is 15.
+    ignore : Iterable[str], optional
+        Regular expressions, matching URLs are not checked. Default is none.
+
+    Attributes
+    ----------
+    checked : int
+        The number of URLs requested in the last run.
+    cached : int
+        The number of URLs served from the cache in the last run.
+
+    Examples
+    --------
+    >>> checker = LinkChecker(cache=git_path('.', CACHE_NAME))
+    >>> broken = [(link, result) for link, result in checker.run(['docs/source'])
+    ...           if not result.ok]
+
+    Inside a notebook, where an event loop is already running:
+
+    >>> results = await checker.check_async(['https://github.com/UN-GCPDS'])
+
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, cache: Optional[Path] = None, ok_ttl: float = 7 * 86400,
+                 broken_ttl: float = 3600, concurrency: int = 32, per_host: int = 4,
+                 timeout: float = 15.0, ignore: Iterable[str] = ()):
+        """Initialize the checker and load the cache if it exists."""
+        self.cache = Path(cache) if cache else None
+        self.ok_ttl = ok_ttl
+        self.broken_ttl = broken_ttl
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.ignore = [re.compile(pattern) for pattern in ignore]
+        self.results: Dict[str, LinkResult] = self._load()
+        self.checked: int = 0
+        self.cached: int = 0
+
+    # ----------------------------------------------------------------------
+    def _load(self) -> Dict[str, LinkResult]:
+        """Read the cache, starting empty when it is missing, corrupt or half-written."""
+        if not self.cache or not self.cache.exists():
+            return {}
+        try:
+            return {url: LinkResult(*result) for url, result
+                    in json.loads(self.cache.read_text()).items()}
+        except (ValueError, TypeError, AttributeError):
+            return {}
+
+    # ----------------------------------------------------------------------
+    def expired(self, url: str, now: Optional[float] = None) -> bool:
+        """Check if a URL has no cached result or its result outlived its TTL."""
+        result = self.results.get(url)
+        if result is None:
+            return True
+        ttl = self.ok_ttl if result.ok else self.broken_ttl
+        return (now or time.time()) - result.checked > ttl
+
+    # ----------------------------------------------------------------------
+    async def _check(self, pool: ConnectionPool, url: str) -> LinkResult:
+        """Follow redirects from `url`, falling back to GET when HEAD is refused."""
+        status, error, location = None, '', url
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                status, headers = await pool.request('HEAD', location)
+                if status >= 400:
+                    status, headers = await pool.request('GET', location)
+                if status not in REDIRECT_STATUS or 'location' not in headers:
+                    break
+                location = urljoin(location, headers['location'])
+            else:
+                error = 'too many redirects'
+        except asyncio.TimeoutError:
+            error = 'timeout'
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError,
+                asyncio.LimitOverrunError) as exception:
+            error = f'{type(exception).__name__}: {exception}'
+
+        ok = not error and status is not None and 200 <= status < 300
+        if not ok and not error:
+            error = f'HTTP {status}'
+        return LinkResult(url, ok, status, error, time.time())
+
+    # ----------------------------------------------------------------------
+    async def check_async(self, urls: Iterable[str]) -> Dict[str, LinkResult]:
+        """Check the URLs that are new or expired, concurrently.
+
+        Parameters
+        ----------
+        urls : Iterable[str]
+            The URLs, fragments are ignored.
+
+        Returns
+        -------
+        Dict[str, LinkResult]
+            The result of every URL, without fragment, cached or fresh.
+
+        """
+        urls = {urldefrag(url).url for url in urls}
+        urls = {url for url in urls if not any(p.search(url) for p in self.ignore)}
+        now = time.time()
+        pending = sorted(url for url in urls if self.expired(url, now))
+        self.checked, self.cached = len(pending), len(urls) - len(pending)
+
+        pool = ConnectionPool(self.timeout)
+        limit = asyncio.Semaphore(self.concurrency)
+        hosts = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+
+        async def check(url: str) -> LinkResult:
+            async with hosts[urlsplit(url).netloc], limit:
+                return await self._check(pool, url)
+
+        try:
+            for result in await asyncio.gather(*map(check, pending)):
+                self.results[result.url] = result
+        finally:
+            pool.close()
+
+        if self.cache and pending:
+            self.cache.write_text(json.dumps(
+                {url: list(result) for url, result in self.results.items()}, indent=1))
+        return {url: self.results[url] for url in urls}
+
+    # ----------------------------------------------------------------------
+    def check(self, urls: Iterable[str]) -> Dict[str, LinkResult]:
+        """Synchronous wrapper around `check_async`.
+
+        When called from a running event loop, e.g. a Jupyter kernel, the check runs on its
+        own loop in a worker thread, since `asyncio.run` cannot be nested.
+
+        Parameters
+        ----------
+        urls : Iterable[str]
+            The URLs to check.
+
+        Returns
+        -------
+        Dict[str, LinkResult]
+            The result of each URL, as returned by `check_async`.
+
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.check_async(urls))
+        with ThreadPoolExecutor(1) as executor:
+            return executor.submit(asyncio.run, self.check_async(list(urls))).result()
+
+    # ----------------------------------------------------------------------
+    def run(self, paths: Iterable[Path]) -> List[Tuple[Link, LinkResult]]:
+        """Extract and check the links of files and directories.
+
+        Parameters
+        ----------
+        paths : Iterable[Path]
+            ``.ipynb`` and ``.rst`` files, or directories searched for them. Notebook
+            checkpoints are skipped.
+
+        Returns
+        -------
+        List[Tuple[Link, LinkResult]]
+            Every checked link with its result, in file order.
+
+        """
+        files = []
+        for path in map(Path, paths):
+            if path.is_dir():
+                files.extend(sorted(file for pattern in ('*.ipynb', '*.rst') for file in path.rglob(pattern)
+                                    if '.ipynb_checkpoints' not in file.parts))
+            else:
+                files.append(path)
+
+        links = [link for file in files for link in extract_links(file)]
+        results = self.check(link.url for link in links)
+        return [(link, results[urldefrag(link.url).url]) for link in links
+                if urldefrag(link.url).url in results]
+
+
+# ----------------------------------------------------------------------
+def main(argv: Optional[list] = None) -> int:
+    """Check links from the command line, returning 1 when some are broken."""
+    parser = argparse.ArgumentParser(
+        description='Check the external links of notebooks and rst sources.')
+    parser.add_argument('paths', nargs='*', default=['.'],
+                        help='files or directories to check')
+    parser.add_argument('--cache', default=None,
+                        help='result cache file, empty to disable, default in the git directory')
+    parser.add_argument('--ok-ttl', type=float, default=7 * 86400)
+    parser.add_argument('--broken-ttl', type=float, default=3600)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--per-host', type=int, default=4)
+    parser.add_argument('--timeout', type=float, default=15.0)
+    parser.add_argument('--ignore', action='append', default=[],
+                        help='regular expression of URLs to skip, can be repeated')
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    args = parser.parse_args(argv)
+
+    cache = git_path('.', CACHE_NAME) if args.cache is None else args.cache or None
+    checker = LinkChecker(cache, args.ok_ttl, args.broken_ttl,
+                          args.concurrency, args.per_host, args.timeout, args.ignore)
+    broken = [(link, result)
+              for link, result in checker.run(args.paths) if not result.ok]
+    if args.format == 'json':
+        sys.stdout.write(json.dumps([dict(link._asdict(), status=result.status, error=result.error)
+                                     for link, result in broken], indent=1) + '\n')
+    else:
+        sys.stdout.writelines(f'{link.source}:{link.location}: {link.url} {result.error}\n'
+                              for link, result in broken)
+    return 1 if broken else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,668 @@
+"""
+==================================
+Best Practices Lint Engine
+==================================
+
+This module checks Python sources against the conventions described in the
+`04_best_practices` notebooks: PEP 8 layout and naming, PEP 257 docstrings, PEP 484
+annotations and the house rules followed by `gcpds.docs`, i.e. numpy-style docstring
+sections, the ``# ----`` and ``####`` separators and logging instead of print.
+
+Files are checked on a process pool and the results are cached per file by content hash,
+so a rerun only checks the files that changed. Results can be emitted as JSON, which makes
+the engine usable as a pre-commit hook. A repository sets its maximum line length and the
+rules it ignores in the ``[gcpds-lint]`` section of its ``setup.cfg`` or ``tox.ini``.
+
+Subsections
+-----------
+- Rules:
+    The per-file checks, see `RULES` for the list of codes.
+- LintEngine:
+    The parallel and cached runner.
+- Command Line:
+    A standalone entry point, ``python lint.py [--staged] [--format json] paths``.
+
+"""
+
+import re
+import io
+import ast
+import sys
+import json
+import hashlib
+import argparse
+import configparser
+import sysconfig
+import tokenize
+import subprocess
+import importlib.util
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+try:
+    from .gitdir import git_path
+except ImportError:
+    from gitdir import git_path
+
+MAX_LINE_LENGTH: int = 79
+CACHE_NAME: str = 'lint_cache.json'
+POOL_THRESHOLD: int = 8
+CONFIG_FILES: tuple = ('setup.cfg', 'tox.ini')
+CONFIG_SECTION: str = 'gcpds-lint'
+
+FUNCTION_SEPARATOR: str = '# ' + '-' * 70
+CLASS_SEPARATOR: str = '#' * 72
+
+RULES: Dict[str, str] = {
+    'GD000': 'file could not be parsed',
+    'GD101': 'indentation contains tabs',
+    'GD102': 'indentation is not a multiple of four',
+    'GD103': 'line too long',
+    'GD104': 'trailing whitespace',
+    'GD201': 'expected two blank lines before top-level definition',
+    'GD301': 'name does not follow the naming conventions',
+    'GD302': 'wildcard import',
+    'GD303': 'imports are not grouped as standard library, third party, local',
+    'GD401': 'missing docstring in public definition',
+    'GD402': 'docstring does not use triple double quotes',
+    'GD403': 'docstring summary layout does not follow PEP 257',
+    'GD404': 'numpy-style section heading is not underlined to its length',
+    'GD405': 'docstring uses Google-style sections instead of numpy-style',
+    'GD406': 'multi-line docstring does not document the parameters',
+    'GD501': 'missing parameter annotation',
+    'GD502': 'missing return annotation',
+    'GD601': 'definition is not preceded by its separator comment',
+    'GD701': 'print call, use logging instead',
+}
+
+NUMPY_SECTIONS: tuple = (
+    'Parameters', 'Returns', 'Yields', 'Receives', 'Raises', 'Warns', 'Warnings',
+    'Other Parameters', 'Attributes', 'Methods', 'See Also', 'Notes', 'References',
+    'Examples', 'Subsections',
+)
+GOOGLE_SECTIONS: tuple = ('Args:', 'Arguments:', 'Returns:',
+                          'Raises:', 'Yields:', 'Attributes:')
+
+_SNAKE_CASE = re.compile(r'^_{0,2}[a-z][a-z0-9_]*$')
+_CAP_WORDS = re.compile(r'^_?[A-Z][a-zA-Z0-9]*$')
+_MIXED_CASE = re.compile(r'^_*[a-z]+[a-z0-9]*[A-Z]')
+
+
+########################################################################
+class Violation(NamedTuple):
+    """A single rule violation.
+
+    Attributes
+    ----------
+    path : str
+        The checked file.
+    line : int
+        The 1-based line number.
+    column : int
+        The 0-based column offset.
+    code : str
+        The rule code, a key of `RULES`.
+    message : str
+        A human readable description.
+
+    """
+
+    path: str
+    line: int
+    column: int
+    code: str
+    message: str
+
+    # ----------------------------------------------------------------------
+    def __str__(self) -> str:
+        """Format the violation as ``path:line:column: code message``."""
+        return f'{self.path}:{self.line}:{self.column}: {self.code} {self.message}'
+
+
+# ----------------------------------------------------------------------
+def _is_stdlib(module: str) -> bool:
+    """Check if a top-level module name belongs to the standard library."""
+    names = getattr(sys, 'stdlib_module_names', None)
+    if names is not None:
+        return module in names
+    if module in sys.builtin_module_names:
+        return True
+    spec = importlib.util.find_spec(module)
+    origin = getattr(spec, 'origin', None) or ''
+    return origin.startswith(sysconfig.get_paths()['stdlib']) and 'site-packages' not in origin
+
+
+# ----------------------------------------------------------------------
+def _local_package(path: str) -> Optional[str]:
+    """Find the top-level package that contains a file, if any."""
+    directory = Path(path).resolve().parent
+    package = None
+    while (directory / '__init__.py').exists():
+        package = directory.name
+        directory = directory.parent
+    return package
+
+
+########################################################################
+class _Checker:
+    """Collect the violations of a single source file.
+
+    Parameters
+    ----------
+    source : str
+        The Python source.
+    path : str
+        The file path, used in the violations and to resolve local imports.
+    max_line_length : int
+        The maximum allowed line length.
+
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, source: str, path: str, max_line_length: int):
+        """Initialize an empty list of violations."""
+        self.source = source
+        self.path = path
+        self.lines = source.splitlines()
+        self.max_line_length = max_line_length
+        self.violations: List[Violation] = []
+
+    # ----------------------------------------------------------------------
+    def report(self, line: int, column: int, code: str, detail: str = '') -> None:
+        """Record a violation."""
+        message = f'{RULES[code]}: {detail}' if detail else RULES[code]
+        self.violations.append(
+            Violation(self.path, line, column, code, message))
+
+    # ----------------------------------------------------------------------
+    def run(self) -> List[Violation]:
+        """Run every check and return the violations sorted by position."""
+        self.check_lines()
+        try:
+            tree = ast.parse(self.source)
+        except SyntaxError as error:
+            self.report(error.lineno or 1, (error.offset or 1) - 1,
+                        'GD000', str(error.msg))
+            return self.violations
+
+        self.check_indentation()
+        self.check_imports(tree)
+        self.check_docstring(tree, 'module')
+        self.check_layout(tree)
+
+        functions = (ast.FunctionDef, ast.AsyncFunctionDef)
+        nested = set()
+        for node in ast.walk(tree):
+            if isinstance(node, functions) and node not in nested:
+                nested.update(child for child in ast.walk(node) if child is not node
+                              and isinstance(child, functions + (ast.ClassDef,)))
+
+        for node in ast.walk(tree):
+            if isinstance(node, functions):
+                self.check_function(node, node not in nested)
+            elif isinstance(node, ast.ClassDef):
+                if not _CAP_WORDS.match(node.name):
+                    self.report(node.lineno, node.col_offset,
+                                'GD301', f'class {node.name!r} should use CapWords')
+                if not node.name.startswith('_') and node not in nested:
+                    self.check_docstring(node, node.name)
+            elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+                if _MIXED_CASE.match(node.id):
+                    self.report(node.lineno, node.col_offset,
+                                'GD301', f'variable {node.id!r} should use snake_case')
+            elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'print':
+                self.report(node.lineno, node.col_offset, 'GD701')
+        return sorted(self.violations, key=lambda v: (v.line, v.column, v.code))
+
+    # ----------------------------------------------------------------------
+    def check_lines(self) -> None:
+        """Check tabs, line length and trailing whitespace."""
+        for number, line in enumerate(self.lines, 1):
+            indent = line[:len(line) - len(line.lstrip())]
+            if '\t' in indent:
+                self.report(number, 0, 'GD101')
+            if len(line) > self.max_line_length:
+                self.report(number, self.max_line_length, 'GD103',
+                            f'{len(line)} > {self.max_line_length}')
+            if line != line.rstrip():
+                self.report(number, len(line.rstrip()), 'GD104')
+
+    # ----------------------------------------------------------------------
+    def check_indentation(self) -> None:
+        """Check that every indentation level is a multiple of four spaces."""
+        try:
+            tokens = list(tokenize.generate_tokens(
+                io.StringIO(self.source).readline))
+        except (tokenize.TokenError, IndentationError):
+            return
+        for token in tokens:
+            if token.type == tokenize.INDENT and '\t' not in token.string and len(token.string) % 4:
+                self.report(token.start[0], 0, 'GD102')
+
+    # ----------------------------------------------------------------------
+    def check_imports(self, tree: ast.Module) -> None:
+        """Check wildcard imports and the standard, third party, local grouping."""
+        local = _local_package(self.path)
+        highest = 0
+        for node in tree.body:
+            if isinstance(node, ast.ImportFrom):
+                if any(alias.name == '*' for alias in node.names):
+                    self.report(node.lineno, node.col_offset,
+                                'GD302', node.module or '.')
+                names = [node.module or ''] if not node.level else []
+            elif isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            else:
+                continue
+
+            for name in names or ['.']:
+                root = name.split('.')[0]
+                if root == '__future__':
+                    continue
+                group = 2 if root in ('.', local) else 0 if _is_stdlib(
+                    root) else 1
+                if group < highest:
+                    self.report(node.lineno, node.col_offset, 'GD303', name)
+                highest = max(highest, group)
+
+    # ----------------------------------------------------------------------
+    def check_layout(self, tree: ast.Module) -> None:
+        """Check blank lines and separator comments around definitions."""
+        definitions = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+        targets = []
+        for node in tree.body:
+            if isinstance(node, definitions):
+                targets.append((node, True))
+            if isinstance(node, ast.ClassDef):
+                targets.extend((child, False) for child in node.body
+                               if isinstance(child, definitions[:2]))
+
+        for node, top_level in targets:
+            start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            above = start - 2
+            expected = CLASS_SEPARATOR if isinstance(
+                node, ast.ClassDef) else FUNCTION_SEPARATOR
+            if above < 0 or self.lines[above].strip() != expected:
+                self.report(start, node.col_offset, 'GD601',
+                            f'expected {expected[:12]}...')
+
+            if not top_level:
+                continue
+            while above >= 0 and self.lines[above].lstrip().startswith('#'):
+                above -= 1
+            blank = 0
+            while above >= 0 and not self.lines[above].strip():
+                blank += 1
+                above -= 1
+            if above >= 0 and blank < 2:
+                self.report(start, 0, 'GD201', f'found {blank}')
+
+    # ----------------------------------------------------------------------
+    def check_function(self, node: ast.FunctionDef, documented: bool) -> None:
+        """Check naming, and for public `documented` functions annotations and docstring."""
+        if not _SNAKE_CASE.match(node.name):
+            self.report(node.lineno, node.col_offset, 'GD301',
+                        f'function {node.name!r} should use snake_case')
+
+        arguments = node.args.posonlyargs + node.args.args + node.args.kwonlyargs
+        for argument in arguments + [node.args.vararg, node.args.kwarg]:
+            if argument and not _SNAKE_CASE.match(argument.arg.lstrip('_') or '_'):
+                self.report(argument.lineno, argument.col_offset, 'GD301',
+                            f'argument {argument.arg!r} should use snake_case')
+
+        public = not node.name.startswith('_') or node.name.endswith('__')
+        if not public or not documented:
+            return
+
+        self.check_docstring(node, node.name)
+        if arguments and arguments[0].arg in ('self', 'cls'):
+            arguments = arguments[1:]
+        for argument in arguments:
+            if argument.annotation is None:
+                self.report(argument.lineno, argument.col_offset,
+                            'GD501', f'{node.name}({argument.arg})')
+        if node.returns is None and node.name != '__init__':
+            self.report(node.lineno, node.col_offset, 'GD502', node.name)
+
+    # ----------------------------------------------------------------------
+    def check_docstring(self, node: ast.AST, name: str) -> None:
+        """Check presence, quotes, PEP 257 layout and numpy-style sections."""
+        body = getattr(node, 'body', [])
+        line = getattr(node, 'lineno', 1)
+        column = getattr(node, 'col_offset', 0)
+        first = body[0] if body else None
+        if not (isinstance(first, ast.Expr) and isinstance(getattr(first, 'value', None), ast.Constant)
+                and isinstance(first.value.value, str)):
+            if body or isinstance(node, ast.Module) and self.source.strip():
+                self.report(line, column, 'GD401', name)
+            return
+
+        docstring = first.value.value
+        opening = self.lines[first.value.lineno - 1].encode()[first.value.col_offset:]
+        if not opening.lstrip(b'rRuU').startswith(b'"""'):
+            self.report(first.lineno, first.col_offset, 'GD402', name)
+
+        lines = [text.strip() for text in docstring.strip().splitlines()]
+        start = first.lineno + docstring[:len(docstring) - len(docstring.lstrip())].count('\n')
+        if len(lines) == 1:
+            if '\n' in docstring:
+                self.report(first.lineno, first.col_offset, 'GD403',
+                            f'{name}: one-line docstring spans several lines')
+            return
+        summary = 3 if set(lines[0]) == {'='} else 1
+        if len(lines) > summary and lines[summary]:
+            self.report(first.lineno, first.col_offset, 'GD403',
+                        f'{name}: summary should be followed by a blank line')
+
+        for i, text in enumerate(lines):
+            if text in NUMPY_SECTIONS:
+                underline = lines[i + 1] if i + 1 < len(lines) else ''
+                if set(underline) != {'-'} or len(underline) != len(text):
+                    self.report(start + i, first.col_offset,
+                                'GD404', f'{name}: {text}')
+            elif text in GOOGLE_SECTIONS:
+                self.report(start + i, first.col_offset,
+                            'GD405', f'{name}: {text}')
+
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            arguments = [a.arg for a in node.args.posonlyargs + node.args.args + node.args.kwonlyargs
+                         if a.arg not in ('self', 'cls')]
+            if arguments and 'Parameters' not in lines:
+                self.report(first.lineno, first.col_offset, 'GD406', name)
+
+
+# ----------------------------------------------------------------------
+def check_source(source: str, path: str = '<string>',
+                 max_line_length: int = MAX_LINE_LENGTH) -> List[Violation]:
+    """Check a Python source against every rule.
+
+    Parameters
+    ----------
+    source : str
+        The Python source.
+    path : str, optional
+        The file path reported in the violations. Default is ``'<string>'``.
+    max_line_length : int, optional
+        The maximum allowed line length. Default is ``MAX_LINE_LENGTH``.
+
+    Returns
+    -------
+    List[Violation]
+        The violations sorted by position.
+
+    Examples
+    --------
+    >>> check_source('def f(x):\\n    return x\\n')[0].code
+    'GD401'
+
+    """
+    return _Checker(source, path, max_line_length).run()
+
+
+# ----------------------------------------------------------------------
+def _check_file(job: Tuple[str, str, int]) -> Tuple[str, List[Violation]]:
+    """Worker entry point for the process pool."""
+    path, source, max_line_length = job
+    return path, check_source(source, path, max_line_length)
+
+
+########################################################################
+class LintEngine:
+    """Check files on a process pool, reusing cached results for unchanged files.
+
+    Parameters
+    ----------
+    cache : Optional[Path], optional
+        The JSON file where results are cached by content hash. Default is None, no cache.
+    max_line_length : int, optional
+        The maximum allowed line length. Default is ``MAX_LINE_LENGTH``.
+    ignore : Iterable[str], optional
+        Rule codes to leave out of the results. Default is none.
+    workers : Optional[int], optional
+        The process pool size, None uses the number of CPUs and 1 checks every file in
+        the calling process. The pool is only started for `POOL_THRESHOLD` or more files
+        to check. Default is None.
+
+    Attributes
+    ----------
+    checked : int
+        The number of files checked in the last run.
+    cached : int
+        The number of files served from the cache in the last run.
+
+    Examples
+    --------
+    >>> engine = LintEngine(cache=git_path('.', CACHE_NAME))
+    >>> violations = engine.run(['gcpds'])
+    >>> print(to_json(violations))
+
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, cache: Optional[Path] = None, max_line_length: int = MAX_LINE_LENGTH,
+                 ignore: Iterable[str] = (), workers: Optional[int] = None):
+        """Initialize the engine and compute the cache fingerprint."""
+        self.cache = Path(cache) if cache else None
+        self.max_line_length = max_line_length
+        self.ignore = frozenset(ignore)
+        self.workers = workers
+        self.checked: int = 0
+        self.cached: int = 0
+        rules = hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+        self.fingerprint: str = f'{rules}:{max_line_length}'
+
+    # ----------------------------------------------------------------------
+    def _load(self) -> Dict[str, dict]:
+        """Read the cache, discarding it when the rules or options changed."""
+        if not self.cache or not self.cache.exists():
+            return {}
+        try:
+            content = json.loads(self.cache.read_text())
+        except ValueError:
+            return {}
+        return content.get('files', {}) if content.get('fingerprint') == self.fingerprint else {}
+
+    # ----------------------------------------------------------------------
+    def run(self, paths: Iterable[Path]) -> List[Violation]:
+        """Check files and directories, directories are searched for ``*.py`` files.
+
+        Parameters
+        ----------
+        paths : Iterable[Path]
+            The files and directories to check.
+
+        Returns
+        -------
+        List[Violation]
+            The violations of every file, sorted by path and position.
+
+        """
+        files = []
+        for path in map(Path, paths):
+            files.extend(sorted(path.rglob('*.py')) if path.is_dir() else [path])
+        return self.run_sources({file.as_posix(): file.read_bytes() for file in files})
+
+    # ----------------------------------------------------------------------
+    def run_sources(self, sources: Dict[str, bytes]) -> List[Violation]:
+        """Check sources that are not read from the working tree, e.g. staged blobs.
+
+        Parameters
+        ----------
+        sources : Dict[str, bytes]
+            The content of each file, keyed by the path used in the results.
+
+        Returns
+        -------
+        List[Violation]
+            The violations of every file, sorted by path and position.
+
+        """
+        entries = self._load()
+        results, jobs, digests = {}, [], {}
+        for key, content in sources.items():
+            digests[key] = hashlib.sha1(content).hexdigest()
+            entry = entries.get(key)
+            if entry and entry['hash'] == digests[key]:
+                results[key] = [Violation(*v) for v in entry['violations']]
+            else:
+                jobs.append((key, content.decode('utf-8', 'replace'),
+                             self.max_line_length))
+
+        self.checked, self.cached = len(jobs), len(results)
+        if len(jobs) >= POOL_THRESHOLD and self.workers != 1:
+            with ProcessPoolExecutor(self.workers) as pool:
+                results.update(pool.map(_check_file, jobs,
+                               chunksize=max(1, len(jobs) // 32)))
+        else:
+            results.update(map(_check_file, jobs))
+
+        if self.cache and jobs:
+            entries.update({key: {'hash': digests[key], 'violations': [list(v) for v in results[key]]}
+                            for key, *_ in jobs})
+            self.cache.write_text(json.dumps(
+                {'fingerprint': self.fingerprint, 'files': entries}))
+
+        return [violation for key in sorted(results) for violation in results[key]
+                if violation.code not in self.ignore]
+
+
+# ----------------------------------------------------------------------
+def to_json(violations: Iterable[Violation]) -> str:
+    """Serialize violations as a JSON list of objects.
+
+    Parameters
+    ----------
+    violations : Iterable[Violation]
+        The violations to serialize.
+
+    Returns
+    -------
+    str
+        The JSON document.
+
+    """
+    return json.dumps([violation._asdict() for violation in violations], indent=1)
+
+
+# ----------------------------------------------------------------------
+def staged_files(repository: Path) -> List[Path]:
+    """List the Python files added or modified in the git index.
+
+    Parameters
+    ----------
+    repository : Path
+        The root of the git working tree.
+
+    Returns
+    -------
+    List[Path]
+        The staged files, as paths inside `repository`.
+
+    """
+    repository = Path(repository)
+    staged = subprocess.run(['git', 'diff', '--cached', '--name-only', '-z', '--diff-filter=AM', '--', '*.py'],
+                            cwd=repository, stdout=subprocess.PIPE, text=True).stdout
+    return [repository / name for name in staged.split('\0') if name]
+
+
+# ----------------------------------------------------------------------
+def staged_sources(repository: Path) -> Dict[str, bytes]:
+    """Read the staged blobs of the Python files added or modified in the git index.
+
+    The index content is what gets committed, the working tree may differ when a file
+    was only partially staged.
+
+    Parameters
+    ----------
+    repository : Path
+        The root of the git working tree.
+
+    Returns
+    -------
+    Dict[str, bytes]
+        The staged content of each file, keyed like the paths of `staged_files`.
+
+    """
+    repository = Path(repository)
+    return {path.as_posix(): subprocess.run(['git', 'show', f':{path.relative_to(repository).as_posix()}'],
+                                            cwd=repository, stdout=subprocess.PIPE, check=True).stdout
+            for path in staged_files(repository)}
+
+
+# ----------------------------------------------------------------------
+def load_config(root: Path) -> dict:
+    """Read the lint settings of a repository.
+
+    The settings are taken from the ``[gcpds-lint]`` section of the first of `CONFIG_FILES`
+    that has one, e.g.::
+
+        [gcpds-lint]
+        max-line-length = 99
+        ignore = GD103,GD701
+
+    Parameters
+    ----------
+    root : Path
+        The repository root.
+
+    Returns
+    -------
+    dict
+        The ``max_line_length`` and ``ignore`` keyword arguments of `LintEngine` that are
+        set, empty when the repository has no settings.
+
+    """
+    for name in CONFIG_FILES:
+        parser = configparser.ConfigParser()
+        parser.read(Path(root) / name, encoding='utf-8')
+        if parser.has_section(CONFIG_SECTION):
+            section = parser[CONFIG_SECTION]
+            config = {}
+            if 'max-line-length' in section:
+                config['max_line_length'] = section.getint('max-line-length')
+            if 'ignore' in section:
+                config['ignore'] = [code.strip() for code in section['ignore'].split(',') if code.strip()]
+            return config
+    return {}
+
+
+# ----------------------------------------------------------------------
+def main(argv: Optional[list] = None) -> int:
+    """Run the engine from the command line, returning 1 when there are violations."""
+    parser = argparse.ArgumentParser(
+        description='Check Python sources against the GCPDS best practices.')
+    parser.add_argument('paths', nargs='*', default=['.'],
+                        help='files or directories to check')
+    parser.add_argument('--staged', action='store_true',
+                        help='check only the Python files staged in the current repository')
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    parser.add_argument('--cache', default=None,
+                        help='result cache file, empty to disable, default in the git directory')
+    parser.add_argument('--max-line-length', type=int, default=None,
+                        help=f'default from the [{CONFIG_SECTION}] settings, or {MAX_LINE_LENGTH}')
+    parser.add_argument('--ignore', default=None,
+                        help=f'comma separated rule codes, default from the [{CONFIG_SECTION}] settings')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    config = load_config('.')
+    if args.max_line_length is not None:
+        config['max_line_length'] = args.max_line_length
+    if args.ignore is not None:
+        config['ignore'] = filter(None, args.ignore.split(','))
+    cache = git_path('.', CACHE_NAME) if args.cache is None else args.cache or None
+    engine = LintEngine(cache, workers=args.workers, **config)
+    if args.staged:
+        violations = engine.run_sources(staged_sources('.'))
+    else:
+        violations = engine.run(args.paths)
+    if args.format == 'json':
+        sys.stdout.write(to_json(violations) + '\n')
+    else:
+        sys.stdout.writelines(f'{violation}\n' for violation in violations)
+    return 1 if violations else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
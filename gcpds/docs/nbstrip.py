@@ -0,0 +1,496 @@
+"""
+=======================================
+Streaming Notebook Output Stripping
+=======================================
+
+This module implements a git clean/smudge filter that removes outputs and execution
+counts from Jupyter notebooks before they are stored in the repository. Notebooks are
+processed in a single streaming pass: the JSON text is copied from input to output as it
+is read, and the values of the ``outputs`` and ``execution_count`` keys are dropped on the
+fly, so a notebook is never loaded fully into memory.
+
+Subsections
+-----------
+- Scanner:
+    A minimal streaming JSON scanner that copies, captures or discards values.
+- Filter:
+    The notebook stripping logic with configurable allow-lists.
+- Git Integration:
+    Helpers to install the filter in a repository and to measure the bytes saved.
+
+Notes
+-----
+This file must remain importable without the rest of the package, it only needs the
+``gitdir.py`` module next to it: git invokes it as a standalone script, i.e.
+``python nbstrip.py``, on every staged notebook.
+
+"""
+
+import re
+import io
+import sys
+import json
+import shlex
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, TextIO
+
+try:
+    from .gitdir import git_path
+except ImportError:
+    from gitdir import git_path
+
+FILTER_NAME: str = 'nbstrip'
+KEEP_TAGS: tuple = ('keep_output',)
+CHUNK_SIZE: int = 1 << 16
+
+_STRING_SPECIAL = re.compile(r'["\\]')
+_NOT_WHITESPACE = re.compile(r'[^ \t\n\r]')
+_LITERAL_END = re.compile(r'[ \t\n\r,\]}]')
+
+
+########################################################################
+class _Scanner:
+    """Streaming JSON scanner that forwards the consumed text to a sink.
+
+    The scanner reads the source in chunks and writes every consumed character to the
+    sink on top of its stack. Pushing ``None`` discards the text, pushing a list's
+    ``append`` captures it.
+
+    Parameters
+    ----------
+    source : TextIO
+        The text stream to read JSON from.
+    write : Callable
+        The default sink for the consumed text.
+
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, source: TextIO, write: Callable):
+        """Initialize the scanner with an empty buffer."""
+        self.source = source
+        self.buffer: str = ''
+        self.pos: int = 0
+        self.sinks: list = [write]
+
+    # ----------------------------------------------------------------------
+    def _fill(self) -> bool:
+        """Read the next chunk when the buffer is exhausted, return False at EOF."""
+        if self.pos < len(self.buffer):
+            return True
+        self.buffer = self.source.read(CHUNK_SIZE)
+        self.pos = 0
+        return bool(self.buffer)
+
+    # ----------------------------------------------------------------------
+    def write(self, text: str) -> None:
+        """Forward text to the active sink."""
+        sink = self.sinks[-1]
+        if sink is not None and text:
+            sink(text)
+
+    # ----------------------------------------------------------------------
+    def discard(self, consume: Callable) -> Optional[str]:
+        """Run a consumer while dropping the text it reads."""
+        self.sinks.append(None)
+        try:
+            return consume()
+        finally:
+            self.sinks.pop()
+
+    # ----------------------------------------------------------------------
+    def capture(self, consume: Callable) -> str:
+        """Run a consumer and return the text it reads instead of forwarding it."""
+        parts = []
+        self.sinks.append(parts.append)
+        try:
+            consume()
+        finally:
+            self.sinks.pop()
+        return ''.join(parts)
+
+    # ----------------------------------------------------------------------
+    def peek(self) -> str:
+        """Return the next character without consuming it, empty at EOF."""
+        return self.buffer[self.pos] if self._fill() else ''
+
+    # ----------------------------------------------------------------------
+    def take(self, expected: Optional[str] = None) -> str:
+        """Consume one character, optionally checking it belongs to `expected`."""
+        char = self.peek()
+        if not char or (expected and char not in expected):
+            raise ValueError(
+                f'Malformed notebook JSON: expected {expected!r}, found {char!r}')
+        self.pos += 1
+        self.write(char)
+        return char
+
+    # ----------------------------------------------------------------------
+    def whitespace(self) -> None:
+        """Consume a run of JSON whitespace."""
+        while self._fill():
+            match = _NOT_WHITESPACE.search(self.buffer, self.pos)
+            end = match.start() if match else len(self.buffer)
+            self.write(self.buffer[self.pos:end])
+            self.pos = end
+            if match:
+                return
+
+    # ----------------------------------------------------------------------
+    def string(self) -> None:
+        """Consume a JSON string, scanning whole runs of plain characters at once."""
+        self.take('"')
+        while self._fill():
+            match = _STRING_SPECIAL.search(self.buffer, self.pos)
+            if not match:
+                self.write(self.buffer[self.pos:])
+                self.pos = len(self.buffer)
+                continue
+            self.write(self.buffer[self.pos:match.end()])
+            self.pos = match.end()
+            if match.group() == '"':
+                return
+            self.take()
+        raise ValueError('Malformed notebook JSON: unterminated string')
+
+    # ----------------------------------------------------------------------
+    def key(self) -> str:
+        """Consume an object key, forwarding it and returning its decoded value."""
+        raw = self.capture(self.string)
+        self.write(raw)
+        return json.loads(raw)
+
+    # ----------------------------------------------------------------------
+    def literal(self) -> None:
+        """Consume a number, ``true``, ``false`` or ``null``."""
+        consumed = False
+        while self._fill():
+            match = _LITERAL_END.search(self.buffer, self.pos)
+            end = match.start() if match else len(self.buffer)
+            consumed = consumed or end > self.pos
+            self.write(self.buffer[self.pos:end])
+            self.pos = end
+            if match:
+                break
+        if not consumed:
+            raise ValueError(
+                f'Malformed notebook JSON: unexpected {self.peek()!r}')
+
+    # ----------------------------------------------------------------------
+    def value(self) -> None:
+        """Consume any JSON value."""
+        char = self.peek()
+        if char == '"':
+            self.string()
+        elif char == '{':
+            self.object()
+        elif char == '[':
+            self.array()
+        else:
+            self.literal()
+
+    # ----------------------------------------------------------------------
+    def object(self, member: Optional[Callable[[str], None]] = None) -> None:
+        """Consume an object, `member` is called with each key to consume its value."""
+        member = member or (lambda key: self.value())
+        self.take('{')
+        self.whitespace()
+        if self.peek() == '}':
+            self.take()
+            return
+        while True:
+            key = self.key()
+            self.whitespace()
+            self.take(':')
+            self.whitespace()
+            member(key)
+            self.whitespace()
+            if self.take(',}') == '}':
+                return
+            self.whitespace()
+
+    # ----------------------------------------------------------------------
+    def array(self, element: Optional[Callable[[], None]] = None) -> None:
+        """Consume an array, `element` is called to consume each item."""
+        element = element or self.value
+        self.take('[')
+        self.whitespace()
+        if self.peek() == ']':
+            self.take()
+            return
+        while True:
+            element()
+            self.whitespace()
+            if self.take(',]') == ']':
+                return
+            self.whitespace()
+
+
+########################################################################
+class NotebookStripper(_Scanner):
+    """Strip outputs and execution counts from a notebook in a single streaming pass.
+
+    Parameters
+    ----------
+    source : TextIO
+        The notebook text to read.
+    target : TextIO
+        The stream where the stripped notebook is written.
+    keep_tags : Iterable[str], optional
+        Cells tagged with any of these tags keep their outputs. Default is ``KEEP_TAGS``.
+    keep_output_types : Iterable[str], optional
+        Output types, e.g. ``'stream'``, that are kept in every cell. Default is none.
+
+    Notes
+    -----
+    Cell tags are read from the cell metadata, which nbformat writes before the outputs.
+    Outputs that appear before the metadata are stripped regardless of the tags. Kept
+    outputs are copied verbatim.
+
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, source: TextIO, target: TextIO,
+                 keep_tags: Iterable[str] = KEEP_TAGS,
+                 keep_output_types: Iterable[str] = ()):
+        """Initialize the stripper with its allow-lists."""
+        super().__init__(source, target.write)
+        self.keep_tags: frozenset = frozenset(keep_tags)
+        self.keep_output_types: frozenset = frozenset(keep_output_types)
+
+    # ----------------------------------------------------------------------
+    def strip(self) -> None:
+        """Process the whole notebook, an empty or blank source is copied unchanged."""
+        self.whitespace()
+        if not self.peek():
+            return
+        self.object(lambda key: self.array(
+            self._cell) if key == 'cells' else self.value())
+        self.whitespace()
+
+    # ----------------------------------------------------------------------
+    def _cell(self) -> None:
+        """Process a single cell object."""
+        keep = False
+
+        def member(key: str) -> None:
+            nonlocal keep
+            if key == 'execution_count':
+                self.discard(self.value)
+                self.write('null')
+            elif key == 'metadata' and self.keep_tags:
+                raw = self.capture(self.value)
+                self.write(raw)
+                tags = json.loads(raw).get('tags', [])
+                keep = bool(self.keep_tags.intersection(tags))
+            elif key == 'outputs' and not keep:
+                self._outputs()
+            else:
+                self.value()
+
+        self.object(member)
+
+    # ----------------------------------------------------------------------
+    def _outputs(self) -> None:
+        """Replace the outputs array, keeping only the allow-listed output types."""
+        if not self.keep_output_types or self.peek() != '[':
+            self.discard(self.value)
+            self.write('[]')
+            return
+
+        self.write('[')
+        self.discard(lambda: self.take('['))
+        kept = 0
+        closing = ''
+        while True:
+            indent = self.capture(self.whitespace)
+            if self.peek() == ']':
+                closing = indent
+                self.discard(self.take)
+                break
+            raw = self.capture(self.value)
+            if json.loads(raw).get('output_type') in self.keep_output_types:
+                self.write((',' if kept else '') + indent + raw)
+                kept += 1
+            closing = self.capture(self.whitespace)
+            if self.discard(lambda: self.take(',]')) == ']':
+                break
+        self.write((closing if kept else '') + ']')
+
+
+# ----------------------------------------------------------------------
+def strip_notebook(source: TextIO, target: TextIO,
+                   keep_tags: Iterable[str] = KEEP_TAGS,
+                   keep_output_types: Iterable[str] = ()) -> None:
+    """Copy a notebook from `source` to `target` without outputs and execution counts.
+
+    Parameters
+    ----------
+    source : TextIO
+        The notebook text to read.
+    target : TextIO
+        The stream where the stripped notebook is written.
+    keep_tags : Iterable[str], optional
+        Cells tagged with any of these tags keep their outputs. Default is ``KEEP_TAGS``.
+    keep_output_types : Iterable[str], optional
+        Output types that are kept in every cell. Default is none.
+
+    Raises
+    ------
+    ValueError
+        If the source is not a well-formed JSON document.
+
+    Examples
+    --------
+    >>> with open('in.ipynb') as source, open('out.ipynb', 'w') as target:
+    ...     strip_notebook(source, target, keep_output_types=['stream'])
+
+    """
+    NotebookStripper(source, target, keep_tags, keep_output_types).strip()
+
+
+# ----------------------------------------------------------------------
+def filter_command(keep_tags: Iterable[str] = KEEP_TAGS,
+                   keep_output_types: Iterable[str] = ()) -> str:
+    """Build the shell command that git runs as the clean filter.
+
+    Parameters
+    ----------
+    keep_tags : Iterable[str], optional
+        Cells tagged with any of these tags keep their outputs. Default is ``KEEP_TAGS``.
+    keep_output_types : Iterable[str], optional
+        Output types that are kept in every cell. Default is none.
+
+    Returns
+    -------
+    str
+        The command, invoking this file as a script with the current interpreter.
+
+    """
+    command = [sys.executable, str(Path(__file__).resolve())]
+    keep_tags = list(keep_tags)
+    for tag in keep_tags:
+        command.extend(['--keep-tag', tag])
+    if not keep_tags:
+        command.append('--no-keep-tags')
+    for output_type in keep_output_types:
+        command.extend(['--keep-output-type', output_type])
+    return ' '.join(shlex.quote(arg) for arg in command)
+
+
+# ----------------------------------------------------------------------
+def install_filter(repository: Path,
+                   keep_tags: Iterable[str] = KEEP_TAGS,
+                   keep_output_types: Iterable[str] = ()) -> None:
+    """Install the notebook stripping filter in a local repository.
+
+    The filter is registered in the repository configuration and bound to ``*.ipynb``
+    through the ``info/attributes`` file of the git directory, so no tracked file is
+    modified. Calling it again updates the allow-lists without duplicating the attribute.
+
+    Parameters
+    ----------
+    repository : Path
+        The root of the git working tree.
+    keep_tags : Iterable[str], optional
+        Cells tagged with any of these tags keep their outputs. Default is ``KEEP_TAGS``.
+    keep_output_types : Iterable[str], optional
+        Output types that are kept in every cell. Default is none.
+
+    Raises
+    ------
+    subprocess.CalledProcessError
+        If git fails to update the configuration.
+
+    """
+    repository = Path(repository)
+    config = {
+        f'filter.{FILTER_NAME}.clean': filter_command(keep_tags, keep_output_types),
+        f'filter.{FILTER_NAME}.smudge': 'cat',
+    }
+    for key, value in config.items():
+        subprocess.run(['git', 'config', key, value],
+                       cwd=repository, check=True)
+
+    attributes = git_path(repository, 'info/attributes')
+    attributes.parent.mkdir(parents=True, exist_ok=True)
+    rule = f'*.ipynb filter={FILTER_NAME}'
+    lines = attributes.read_text().splitlines() if attributes.exists() else []
+    if rule not in lines:
+        attributes.write_text('\n'.join(lines + [rule]) + '\n')
+
+
+# ----------------------------------------------------------------------
+def bytes_saved(repository: Path) -> Dict[str, int]:
+    """Measure the bytes removed from the notebooks currently staged for commit.
+
+    Parameters
+    ----------
+    repository : Path
+        The root of the git working tree.
+
+    Returns
+    -------
+    Dict[str, int]
+        The difference between the working tree size and the staged blob size, for each
+        added or modified notebook.
+
+    """
+    repository = Path(repository)
+    staged = subprocess.run(['git', 'diff', '--cached', '--name-only', '-z', '--diff-filter=AM', '--', '*.ipynb'],
+                            cwd=repository, stdout=subprocess.PIPE, text=True).stdout
+
+    saved = {}
+    for name in filter(None, staged.split('\0')):
+        blob = subprocess.run(['git', 'cat-file', '-s', f':{name}'],
+                              cwd=repository, stdout=subprocess.PIPE, text=True).stdout
+        path = repository / name
+        if blob.strip().isdigit() and path.exists():
+            saved[name] = path.stat().st_size - int(blob)
+    return saved
+
+
+# ----------------------------------------------------------------------
+def main(argv: Optional[list] = None) -> int:
+    """Run the clean filter, reading a notebook from stdin and writing it to stdout.
+
+    Parameters
+    ----------
+    argv : Optional[list], optional
+        The command line arguments. Default is None, ``sys.argv``.
+
+    Returns
+    -------
+    int
+        The exit status, 1 when the notebook is malformed. The error is reported in a single
+        line on stderr and git then stores the file unfiltered.
+
+    """
+    parser = argparse.ArgumentParser(
+        description='Strip outputs and execution counts from a Jupyter notebook.')
+    parser.add_argument('--keep-tag', action='append', dest='keep_tags', default=None,
+                        help=f'cells with this tag keep their outputs, can be repeated, '
+                             f'default is {", ".join(KEEP_TAGS)}')
+    parser.add_argument('--no-keep-tags', action='store_true',
+                        help='strip the outputs of every cell, regardless of its tags')
+    parser.add_argument('--keep-output-type', action='append', dest='keep_output_types', default=[],
+                        help='output type kept in every cell, e.g. stream')
+    args = parser.parse_args(argv)
+    keep_tags = () if args.no_keep_tags else args.keep_tags or KEEP_TAGS
+
+    source = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', newline='')
+    target = io.TextIOWrapper(
+        sys.stdout.buffer, encoding='utf-8', newline='')
+    try:
+        strip_notebook(source, target, keep_tags, args.keep_output_types)
+    except ValueError as error:
+        sys.stderr.write(f'nbstrip: {error}\n')
+        return 1
+    target.flush()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
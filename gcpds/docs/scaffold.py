@@ -0,0 +1,235 @@
+"""
+================================
+In-Process Project Scaffolding
+================================
+
+This module renders the files a GCPDS repository needs to be packaged and documented:
+``setup.py``, ``.readthedocs.yml``, ``docs/requirements``, ``docs/Makefile``,
+``docs/source/conf.py``, ``docs/source/index.rst`` and the Sphinx apidoc templates. Every
+file comes from the templates shipped in ``gcpds/docs/templates``: ``*.tpl`` templates are
+filled with a single parameter set, the same one stored in the ``DOCS_*`` repository
+variables, and the other files are copied verbatim.
+
+Rendering only uses the standard library, so it takes milliseconds and needs neither
+Docker nor extra packages. Writes are idempotent: a file whose content would not change
+is never touched, and existing files are kept unless overwriting is requested.
+
+Subsections
+-----------
+- Scaffold:
+    The parameter set and the rendering and writing logic.
+- Command Line:
+    A standalone entry point used by the GitHub workflows, ``python scaffold.py --help``.
+
+"""
+
+import sys
+import argparse
+import datetime
+import subprocess
+from pathlib import Path
+from string import Template
+from typing import Dict, Iterable, Optional
+
+TEMPLATES_DIR: Path = Path(__file__).parent / 'templates'
+
+FILES: Dict[str, str] = {
+    'setup.py': 'setup.py.tpl',
+    '.readthedocs.yml': 'readthedocs.yml.tpl',
+    'docs/requirements': 'requirements',
+    'docs/Makefile': 'Makefile',
+    'docs/source/conf.py': 'conf.py.tpl',
+    'docs/source/index.rst': 'index.rst.tpl',
+    'docs/source/_templates/module.rst_t': 'module.rst_t',
+    'docs/source/_templates/package.rst_t': 'package.rst_t',
+    'docs/source/_templates/toc.rst_t': 'toc.rst_t',
+}
+
+
+########################################################################
+class Scaffold:
+    """Render and write the packaging and documentation files of a repository.
+
+    Parameters
+    ----------
+    project : str
+        The documentation project name, i.e. ``DOCS_PROJECT_NAME``.
+    author : str
+        The author's full name, i.e. ``DOCS_AUTHOR``.
+    email : str
+        The author's email address, i.e. ``DOCS_EMAIL``.
+    module : str
+        The top-level package, i.e. ``DOCS_MODULE``.
+    submodule : Optional[str], optional
+        The subpackage, i.e. ``DOCS_SUBMODULE``. Default is None.
+    version : str, optional
+        The initial package version. Default is ``'0.1'``.
+    python : str, optional
+        The Python version used by Read the Docs. Default is ``'3.11'``.
+
+    Attributes
+    ----------
+    parameters : Dict[str, str]
+        The values substituted in the templates, those used in Python sources are already
+        quoted as literals so any author or project name renders valid code.
+
+    Examples
+    --------
+    >>> scaffold = Scaffold('GCPDS - Docs', 'Yeison Cardona', 'yencardonaal@unal.edu.co',
+    ...                     'gcpds', 'docs')
+    >>> scaffold.write('.')
+    {'setup.py': 'unchanged', '.readthedocs.yml': 'created', ...}
+
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, project: str, author: str, email: str, module: str,
+                 submodule: Optional[str] = None, version: str = '0.1', python: str = '3.11'):
+        """Build the parameter set shared by every template."""
+        packages = [module, f'{module}.{submodule}'] if submodule else [module]
+        year = datetime.date.today().year
+        self.parameters: Dict[str, str] = {
+            'project': repr(project),
+            'title': project,
+            'title_rule': '=' * len(project),
+            'author': repr(author),
+            'email': repr(email),
+            'copyright': repr(f'{year}, {author}'),
+            'name': repr(f'{module}-{submodule}' if submodule else module),
+            'packages': repr(packages).replace("'", '"'),
+            'version': repr(version),
+            'python': python,
+            'source_path': repr(f'../../{module}' if submodule else '../..'),
+        }
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def from_repository(cls, repository: Path, author: str, email: str, **kwargs) -> 'Scaffold':
+        """Infer the module and submodule from the ``python-<module>.<submodule>`` remote name.
+
+        Parameters
+        ----------
+        repository : Path
+            The root of the git working tree, its ``origin`` remote is inspected.
+        author : str
+            The author's full name.
+        email : str
+            The author's email address.
+        **kwargs : dict, optional
+            Additional keyword arguments passed to `Scaffold`.
+
+        Returns
+        -------
+        Scaffold
+            The scaffold, with a project name like ``'GCPDS - Docs'``.
+
+        Raises
+        ------
+        ValueError
+            If the repository has no ``origin`` remote.
+
+        """
+        url = subprocess.run(['git', 'remote', 'get-url', 'origin'], cwd=repository,
+                             stdout=subprocess.PIPE, text=True).stdout.strip()
+        name = url.rstrip('/').rsplit('/', 1)[-1]
+        name = name[:-len('.git')] if name.endswith('.git') else name
+        name = name[len('python-'):] if name.startswith('python-') else name
+        module, _, submodule = name.partition('.')
+        if not module:
+            raise ValueError(f'Cannot infer the module from the origin remote {url!r}')
+        project = f'{module.upper()} - {submodule.title()}' if submodule else module.upper()
+        return cls(kwargs.pop('project', project), author, email, module, submodule or None, **kwargs)
+
+    # ----------------------------------------------------------------------
+    def render(self, filename: str) -> str:
+        """Render one of the `FILES`.
+
+        Parameters
+        ----------
+        filename : str
+            The destination path, relative to the repository root.
+
+        Returns
+        -------
+        str
+            The file content, templates without the ``.tpl`` suffix are returned as is.
+
+        """
+        template = (TEMPLATES_DIR / FILES[filename]).read_text()
+        if not FILES[filename].endswith('.tpl'):
+            return template
+        return Template(template).substitute(self.parameters)
+
+    # ----------------------------------------------------------------------
+    def write(self, root: Path, overwrite: bool = False,
+              only: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Write the rendered files under a repository root.
+
+        Parameters
+        ----------
+        root : Path
+            The repository root.
+        overwrite : bool, optional
+            If True, replace existing files whose content differs. Default is False.
+        only : Optional[Iterable[str]], optional
+            Restrict the output to these `FILES`. Default is None, every file.
+
+        Returns
+        -------
+        Dict[str, str]
+            The status of each file: ``'created'``, ``'updated'``, ``'unchanged'`` or
+            ``'skipped'`` for existing files kept because `overwrite` is False.
+
+        Raises
+        ------
+        KeyError
+            If `only` contains a file that is not in `FILES`.
+
+        """
+        status = {}
+        for filename in (list(only) if only else FILES):
+            content = self.render(filename)
+            path = Path(root) / filename
+            if not path.exists():
+                status[filename] = 'created'
+            elif path.read_text() == content:
+                status[filename] = 'unchanged'
+            elif overwrite:
+                status[filename] = 'updated'
+            else:
+                status[filename] = 'skipped'
+
+            if status[filename] in ('created', 'updated'):
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(content)
+        return status
+
+
+# ----------------------------------------------------------------------
+def main(argv: Optional[list] = None) -> None:
+    """Render the scaffold from the command line, as the GitHub workflows do."""
+    parser = argparse.ArgumentParser(
+        description='Render the packaging and documentation files of a GCPDS repository.')
+    parser.add_argument('--project', required=True)
+    parser.add_argument('--author', required=True)
+    parser.add_argument('--email', required=True)
+    parser.add_argument('--module', required=True)
+    parser.add_argument('--submodule', default='',
+                        help='empty when the repository has no submodule')
+    parser.add_argument('--version', default='0.1')
+    parser.add_argument('--python', default='3.11')
+    parser.add_argument('--root', default='.')
+    parser.add_argument('--overwrite', action='store_true')
+    parser.add_argument('--only', action='append', choices=list(FILES),
+                        help='render only this file, can be repeated')
+    args = parser.parse_args(argv)
+
+    scaffold = Scaffold(args.project, args.author, args.email, args.module,
+                        args.submodule or None, args.version, args.python)
+    status = scaffold.write(args.root, args.overwrite, args.only)
+    sys.stdout.writelines(
+        f'{state}: {filename}\n' for filename, state in status.items())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+$title
+$title_rule
+
+.. toctree::
+   :glob:
+   :maxdepth: 2
+   :name: mastertoc
+   :caption: Code Reference
+
+   _modules/*
+
+
+.. only:: html
+
+    Indices and tables
+    ==================
+
+    * :ref:`genindex`
+    * :ref:`modindex`
+    * :ref:`search`
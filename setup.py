@@ -8,7 +8,7 @@ os.chdir(os.path.normpath(os.path.join(os.path.abspath(__file__), os.pardir)))
 
 setup(
     name="gcpds-docs",
-    version='0.5',
+    version='0.6',
     packages=["gcpds", "gcpds.docs"],
     author="Yeison Cardona",
     author_email="yencardonaal@unal.edu.co",
@@ -0,0 +1,115 @@
+"""
+Tests for `gcpds.docs.export` on notebooks written to a temporary directory.
+
+The module is imported from its directory, the `gcpds.docs` package imports the
+notebook widgets.
+"""
+
+import sys
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / 'gcpds' / 'docs'))
+import export  # noqa: E402
+
+
+########################################################################
+class TestNotebookExporter(unittest.TestCase):
+    """Export cells tagged for ``module.py`` and edit them between exports."""
+
+    # ----------------------------------------------------------------------
+    def setUp(self) -> None:
+        """Create an exporter rooted in a temporary directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.notebook = self.root / 'research.ipynb'
+        self.module = self.root / 'module.py'
+        self.exporter = export.NotebookExporter(
+            self.root, 'module.py', self.root / 'index.json')
+
+    # ----------------------------------------------------------------------
+    def tearDown(self) -> None:
+        """Remove the temporary directory."""
+        self.tmp.cleanup()
+
+    # ----------------------------------------------------------------------
+    def write(self, **cells: str) -> None:
+        """Write the notebook with one exported code cell per keyword, in order."""
+        self.notebook.write_text(json.dumps({'cells': [
+            {'cell_type': 'code', 'id': cell, 'metadata': {'tags': ['export']},
+             'source': source, 'outputs': [], 'execution_count': None}
+            for cell, source in cells.items()
+        ]}))
+
+    # ----------------------------------------------------------------------
+    def export(self, **cells: str) -> str:
+        """Write and export the notebook, returning the module source."""
+        self.write(**cells)
+        self.exporter.export(self.notebook)
+        return self.module.read_text()
+
+    # ----------------------------------------------------------------------
+    def test_blocks(self) -> None:
+        text = self.export(a='a = 1', b='b = 2')
+        self.assertEqual(text, '# export: research.ipynb#a\na = 1\n# end export\n\n\n'
+                               '# export: research.ipynb#b\nb = 2\n# end export\n')
+
+    # ----------------------------------------------------------------------
+    def test_replace_last(self) -> None:
+        self.export(a='a = 1', b='b = 2')
+        text = self.export(a='a = 1', n='n = 3')
+        self.assertEqual(text, '# export: research.ipynb#a\na = 1\n# end export\n\n\n'
+                               '# export: research.ipynb#n\nn = 3\n# end export\n')
+
+    # ----------------------------------------------------------------------
+    def test_add_remove_cycle(self) -> None:
+        first = self.export(a='a = 1', b='b = 2')
+        for _ in range(3):
+            self.export(a='a = 1')
+            self.assertTrue(self.module.read_text().endswith('a = 1\n# end export\n'))
+            self.assertEqual(self.export(a='a = 1', b='b = 2'), first)
+
+    # ----------------------------------------------------------------------
+    def test_remove_first(self) -> None:
+        self.export(a='a = 1', b='b = 2')
+        text = self.export(b='b = 2')
+        self.assertEqual(text, '# export: research.ipynb#b\nb = 2\n# end export\n')
+
+    # ----------------------------------------------------------------------
+    def test_remove_middle(self) -> None:
+        self.export(a='a = 1', b='b = 2', c='c = 3')
+        text = self.export(a='a = 1', c='c = 3')
+        self.assertEqual(text, '# export: research.ipynb#a\na = 1\n# end export\n\n\n'
+                               '# export: research.ipynb#c\nc = 3\n# end export\n')
+
+    # ----------------------------------------------------------------------
+    def test_handwritten(self) -> None:
+        self.export(a='a = 1', b='b = 2')
+        self.module.write_text(self.module.read_text() + '\n\ndef handwritten():\n    return a\n')
+        text = self.export(a='a = 10')
+        self.assertEqual(text, '# export: research.ipynb#a\na = 10\n# end export\n\n\n'
+                               'def handwritten():\n    return a\n')
+
+    # ----------------------------------------------------------------------
+    def test_magics(self) -> None:
+        text = self.export(a="%matplotlib inline\n!pip install numpy\nmessage = ('%d of %d'\n"
+                             "           % (1, 2))\ndoc = \"\"\"\n%not a magic\n\"\"\"")
+        self.assertEqual(text, "# export: research.ipynb#a\nmessage = ('%d of %d'\n"
+                               "           % (1, 2))\ndoc = \"\"\"\n%not a magic\n\"\"\"\n# end export\n")
+        compile(text, 'module.py', 'exec')
+
+    # ----------------------------------------------------------------------
+    def test_cell_magic(self) -> None:
+        text = self.export(a='a = 1', b='%%bash\nls -la')
+        self.assertEqual(text, '# export: research.ipynb#a\na = 1\n# end export\n')
+
+    # ----------------------------------------------------------------------
+    def test_unchanged(self) -> None:
+        self.export(a='a = 1')
+        self.assertEqual(self.exporter.export(self.notebook), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+"""
+Tests for `gcpds.docs.linkcheck` against a local HTTP stand-in server.
+
+The module is imported from its directory: it only needs the standard library,
+while the `gcpds.docs` package imports the notebook widgets.
+"""
+
+import sys
+import json
+import asyncio
+import tempfile
+import unittest
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, str(Path(__file__).parents[1] / 'gcpds' / 'docs'))
+import linkcheck  # noqa: E402
+
+
+########################################################################
+class StandIn(BaseHTTPRequestHandler):
+    """Answer a fixed set of paths and record every request."""
+
+    protocol_version = 'HTTP/1.1'
+    requests = []
+
+    # ----------------------------------------------------------------------
+    def log_message(self, *args) -> None:
+        """Keep the test output quiet."""
+
+    # ----------------------------------------------------------------------
+    def reply(self) -> None:
+        """Send the response of the requested path."""
+        self.requests.append((self.command, self.path))
+        headers = {}
+        if self.path == '/ok':
+            status = 200
+        elif self.path == '/redirect':
+            status, headers = 301, {'Location': '/ok'}
+        elif self.path == '/loop':
+            status, headers = 302, {'Location': '/loop'}
+        elif self.path == '/nohead':
+            status = 405 if self.command == 'HEAD' else 200
+        else:
+            status = 404
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        if self.command == 'GET':
+            self.wfile.write(b'ok')
+
+    do_HEAD = do_GET = reply
+
+
+########################################################################
+class TestLinkChecker(unittest.TestCase):
+    """Check URLs served by `StandIn`."""
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Start the stand-in server on a free port."""
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StandIn)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f'http://127.0.0.1:{cls.server.server_port}'
+
+    # ----------------------------------------------------------------------
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Stop the stand-in server."""
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    # ----------------------------------------------------------------------
+    def setUp(self) -> None:
+        """Use a fresh cache and request log for each test."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = Path(self.tmp.name) / 'cache.json'
+        StandIn.requests.clear()
+
+    # ----------------------------------------------------------------------
+    def tearDown(self) -> None:
+        """Remove the cache."""
+        self.tmp.cleanup()
+
+    # ----------------------------------------------------------------------
+    def check(self, *paths: str) -> Tuple['linkcheck.LinkChecker', Dict[str, 'linkcheck.LinkResult']]:
+        """Check URLs on the stand-in with a new checker."""
+        checker = linkcheck.LinkChecker(self.cache, timeout=5)
+        return checker, checker.check(self.base + path for path in paths)
+
+    # ----------------------------------------------------------------------
+    def test_ok(self) -> None:
+        _, results = self.check('/ok')
+        result = results[f'{self.base}/ok']
+        self.assertTrue(result.ok)
+        self.assertEqual(result.status, 200)
+        self.assertEqual(StandIn.requests, [('HEAD', '/ok')])
+
+    # ----------------------------------------------------------------------
+    def test_redirect(self) -> None:
+        _, results = self.check('/redirect')
+        self.assertTrue(results[f'{self.base}/redirect'].ok)
+        self.assertEqual(StandIn.requests, [('HEAD', '/redirect'), ('HEAD', '/ok')])
+
+    # ----------------------------------------------------------------------
+    def test_redirect_loop(self) -> None:
+        _, results = self.check('/loop')
+        result = results[f'{self.base}/loop']
+        self.assertFalse(result.ok)
+        self.assertEqual(result.error, 'too many redirects')
+
+    # ----------------------------------------------------------------------
+    def test_head_fallback(self) -> None:
+        _, results = self.check('/nohead')
+        self.assertTrue(results[f'{self.base}/nohead'].ok)
+        self.assertEqual(StandIn.requests, [('HEAD', '/nohead'), ('GET', '/nohead')])
+
+    # ----------------------------------------------------------------------
+    def test_not_found(self) -> None:
+        _, results = self.check('/missing')
+        result = results[f'{self.base}/missing']
+        self.assertFalse(result.ok)
+        self.assertEqual(result.status, 404)
+        self.assertEqual(result.error, 'HTTP 404')
+
+    # ----------------------------------------------------------------------
+    def test_fragment(self) -> None:
+        checker, results = self.check('/ok#one', '/ok#two')
+        self.assertEqual(list(results), [f'{self.base}/ok'])
+        self.assertEqual(checker.checked, 1)
+        self.assertEqual(StandIn.requests, [('HEAD', '/ok')])
+
+    # ----------------------------------------------------------------------
+    def test_cache(self) -> None:
+        paths = '/ok', '/redirect', '/nohead', '/missing'
+        checker, first = self.check(*paths)
+        self.assertEqual((checker.checked, checker.cached), (4, 0))
+        self.assertTrue(self.cache.exists())
+
+        StandIn.requests.clear()
+        checker, second = self.check(*paths)
+        self.assertEqual((checker.checked, checker.cached), (0, 4))
+        self.assertEqual(StandIn.requests, [])
+        self.assertEqual(first, second)
+
+    # ----------------------------------------------------------------------
+    def test_corrupt_cache(self) -> None:
+        for content in ('{"http://', '[]', '{"http://example.org": [1]}'):
+            self.cache.write_text(content)
+            checker, results = self.check('/ok')
+            self.assertEqual((checker.checked, checker.cached), (1, 0))
+            self.assertTrue(results[f'{self.base}/ok'].ok)
+
+    # ----------------------------------------------------------------------
+    def test_running_loop(self) -> None:
+        async def check():
+            return self.check('/ok')[1]
+
+        results = asyncio.run(check())
+        self.assertTrue(results[f'{self.base}/ok'].ok)
+
+    # ----------------------------------------------------------------------
+    def test_run(self) -> None:
+        notebook = Path(self.tmp.name) / 'links.ipynb'
+        notebook.write_text(json.dumps({'cells': [
+            {'cell_type': 'markdown', 'source': [f'[ok]({self.base}/ok#section) and {self.base}/missing']},
+            {'cell_type': 'code', 'source': [f"url = '{self.base}/code'"]},
+        ]}))
+        checker = linkcheck.LinkChecker(self.cache, timeout=5)
+        links = {link.url: result.ok for link, result in checker.run([self.tmp.name])}
+        self.assertEqual(links, {f'{self.base}/ok#section': True, f'{self.base}/missing': False})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+"""
+Tests for `gcpds.docs.lint`, its rules, its result cache and its settings.
+
+The module is imported from its directory, the `gcpds.docs` package imports the
+notebook widgets.
+"""
+
+import sys
+import tempfile
+import unittest
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / 'gcpds' / 'docs'))
+import lint  # noqa: E402
+
+REPOSITORY = Path(__file__).parents[1]
+
+CLEAN = '''"""Join paths."""
+
+import os
+
+
+# ----------------------------------------------------------------------
+def join(base: str, name: str) -> str:
+    """Join a path."""
+    return os.path.join(base, name)
+
+
+########################################################################
+class Store:
+    """Keep values.
+
+    Parameters
+    ----------
+    size : int
+        The capacity.
+
+    """
+
+    # ----------------------------------------------------------------------
+    def __init__(self, size: int):
+        """Initialize the store."""
+        self.size = size
+'''
+
+CASES = {
+    'GD000': 'def join(:\n',
+    'GD101': 'if True:\n\tvalue = 1\n',
+    'GD102': 'if True:\n  value = 1\n',
+    'GD103': CLEAN.replace('"""Join a path."""', '"""Join a path, ' + 'x' * 70 + '."""'),
+    'GD104': CLEAN.replace('import os\n', 'import os  \n'),
+    'GD201': CLEAN.replace('import os\n\n\n', 'import os\n\n'),
+    'GD301': CLEAN.replace('def join(', 'def joinPath('),
+    'GD302': CLEAN.replace('import os\n', 'import os\nfrom os.path import *\n'),
+    'GD303': CLEAN.replace('import os\n', 'import numpy\nimport os\n'),
+    'GD401': CLEAN.replace('    """Join a path."""\n', ''),
+    'GD402': CLEAN.replace('"""Join a path."""', "'''Join a path.'''"),
+    'GD403': CLEAN.replace('"""Keep values.\n\n', '"""Keep values.\n'),
+    'GD404': CLEAN.replace('    ----------\n', '    ------\n'),
+    'GD405': CLEAN.replace('    Parameters\n    ----------\n', '    Args:\n'),
+    'GD406': CLEAN.replace('"""Join a path."""', '"""Join a path.\n\n    The base comes first.\n    """'),
+    'GD501': CLEAN.replace('base: str,', 'base,'),
+    'GD502': CLEAN.replace(') -> str:', '):'),
+    'GD601': CLEAN.replace('# ' + '-' * 70 + '\ndef join', 'def join'),
+    'GD701': CLEAN.replace('    return os.path', '    print(base)\n    return os.path'),
+}
+
+
+# ----------------------------------------------------------------------
+def codes(source: str) -> set:
+    """Collect the rule codes reported for a source."""
+    return {violation.code for violation in lint.check_source(source, 'module.py')}
+
+
+########################################################################
+class TestRules(unittest.TestCase):
+    """Check one source per rule."""
+
+    # ----------------------------------------------------------------------
+    def test_clean(self) -> None:
+        self.assertEqual(lint.check_source(CLEAN, 'module.py'), [])
+
+    # ----------------------------------------------------------------------
+    def test_every_rule(self) -> None:
+        self.assertEqual(set(CASES), set(lint.RULES))
+        for code, source in CASES.items():
+            self.assertIn(code, codes(source), code)
+
+    # ----------------------------------------------------------------------
+    def test_max_line_length(self) -> None:
+        self.assertEqual(codes(CASES['GD103']), {'GD103'})
+        self.assertEqual(lint.check_source(CASES['GD103'], 'module.py', 120), [])
+
+    # ----------------------------------------------------------------------
+    def test_nested(self) -> None:
+        source = CLEAN.replace('    return os.path.join(base, name)\n',
+                               '    def inner(x):\n        return x\n    return inner(base)\n')
+        self.assertEqual(lint.check_source(source, 'module.py'), [])
+
+    # ----------------------------------------------------------------------
+    def test_violation(self) -> None:
+        violation = lint.check_source(CASES['GD701'], 'module.py')[0]
+        self.assertEqual(str(violation), 'module.py:9:4: GD701 print call, use logging instead')
+
+
+########################################################################
+class TestLintEngine(unittest.TestCase):
+    """Run the engine on files in a temporary directory."""
+
+    # ----------------------------------------------------------------------
+    def setUp(self) -> None:
+        """Write one clean and one failing file."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.cache = self.root / 'cache.json'
+        (self.root / 'clean.py').write_text(CLEAN)
+        (self.root / 'print.py').write_text(CASES['GD701'])
+
+    # ----------------------------------------------------------------------
+    def tearDown(self) -> None:
+        """Remove the temporary directory."""
+        self.tmp.cleanup()
+
+    # ----------------------------------------------------------------------
+    def run_engine(self, **kwargs) -> tuple:
+        """Run a new engine on the temporary directory."""
+        engine = lint.LintEngine(self.cache, **kwargs)
+        violations = engine.run([self.root])
+        return engine, [violation.code for violation in violations]
+
+    # ----------------------------------------------------------------------
+    def test_cache(self) -> None:
+        engine, first = self.run_engine()
+        self.assertEqual((engine.checked, engine.cached), (2, 0))
+        self.assertEqual(first, ['GD701'])
+
+        engine, second = self.run_engine()
+        self.assertEqual((engine.checked, engine.cached), (0, 2))
+        self.assertEqual(second, first)
+
+        (self.root / 'print.py').write_text(CLEAN)
+        engine, third = self.run_engine()
+        self.assertEqual((engine.checked, engine.cached), (1, 1))
+        self.assertEqual(third, [])
+
+    # ----------------------------------------------------------------------
+    def test_fingerprint(self) -> None:
+        self.run_engine()
+        engine, _ = self.run_engine(max_line_length=120)
+        self.assertEqual((engine.checked, engine.cached), (2, 0))
+
+    # ----------------------------------------------------------------------
+    def test_corrupt_cache(self) -> None:
+        self.cache.write_text('{"fingerprint": ')
+        engine, violations = self.run_engine()
+        self.assertEqual((engine.checked, engine.cached), (2, 0))
+        self.assertEqual(violations, ['GD701'])
+
+    # ----------------------------------------------------------------------
+    def test_ignore(self) -> None:
+        engine, violations = self.run_engine(ignore=['GD701'])
+        self.assertEqual(violations, [])
+
+    # ----------------------------------------------------------------------
+    def test_pool(self) -> None:
+        sources = {f'module_{i}.py': source.encode()
+                   for i, source in enumerate(list(CASES.values()) * 2)}
+        self.assertGreaterEqual(len(sources), lint.POOL_THRESHOLD)
+        serial = lint.LintEngine(workers=1).run_sources(sources)
+        pooled = lint.LintEngine(workers=2).run_sources(sources)
+        self.assertEqual(pooled, serial)
+
+    # ----------------------------------------------------------------------
+    def test_staged_sources(self) -> None:
+        subprocess.run(['git', 'init', '-q'], cwd=self.root, check=True)
+        subprocess.run(['git', 'add', 'print.py'], cwd=self.root, check=True)
+        (self.root / 'print.py').write_text(CLEAN)
+
+        sources = lint.staged_sources(self.root)
+        self.assertEqual(sources, {(self.root / 'print.py').as_posix(): CASES['GD701'].encode()})
+        found = [violation.code for violation in lint.LintEngine().run_sources(sources)]
+        self.assertEqual(found, ['GD701'])
+
+    # ----------------------------------------------------------------------
+    def test_load_config(self) -> None:
+        self.assertEqual(lint.load_config(self.root), {})
+        (self.root / 'tox.ini').write_text('[gcpds-lint]\nmax-line-length = 99\n')
+        self.assertEqual(lint.load_config(self.root), {'max_line_length': 99})
+        (self.root / 'setup.cfg').write_text('[gcpds-lint]\nignore = GD103, GD701\n')
+        self.assertEqual(lint.load_config(self.root), {'ignore': ['GD103', 'GD701']})
+
+    # ----------------------------------------------------------------------
+    def test_repository(self) -> None:
+        engine = lint.LintEngine(**lint.load_config(REPOSITORY))
+        self.assertEqual(engine.run([REPOSITORY / 'gcpds']), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
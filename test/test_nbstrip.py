@@ -0,0 +1,183 @@
+"""
+Tests for `gcpds.docs.nbstrip`, the streaming notebook output stripping filter.
+
+The module is imported from its directory, the `gcpds.docs` package imports the
+notebook widgets. Results are compared with a plain `json` round trip.
+"""
+
+import io
+import sys
+import json
+import tempfile
+import unittest
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / 'gcpds' / 'docs'))
+import nbstrip  # noqa: E402
+
+REPOSITORY = Path(__file__).parents[1]
+
+NOTEBOOK = {
+    'cells': [
+        {'cell_type': 'markdown', 'id': 'text', 'metadata': {},
+         'source': ['Quotes \\" and escapes \\\\ in "outputs", \\u00e9 é \U0001F600\n']},
+        {'cell_type': 'code', 'execution_count': 7, 'id': 'plot', 'metadata': {},
+         'outputs': [{'output_type': 'stream', 'name': 'stdout', 'text': ['"outputs": [1]\\n\n']},
+                     {'output_type': 'display_data', 'data': {'text/plain': ['<Figure>']}, 'metadata': {}}],
+         'source': ['print("\\"outputs\\": [1]\\\\n")']},
+        {'cell_type': 'code', 'execution_count': 8, 'id': 'kept', 'metadata': {'tags': ['keep_output']},
+         'outputs': [{'output_type': 'execute_result', 'data': {'text/plain': ['42']},
+                      'execution_count': 8, 'metadata': {}}],
+         'source': ['6 * 7']},
+    ],
+    'metadata': {'kernelspec': {'name': 'python3', 'language': 'python'}, 'outputs': [1]},
+    'nbformat': 4,
+    'nbformat_minor': 5,
+}
+
+
+# ----------------------------------------------------------------------
+def dumps(notebook: dict) -> str:
+    """Serialize a notebook the way nbformat writes it."""
+    return json.dumps(notebook, indent=1, sort_keys=True, ensure_ascii=False) + '\n'
+
+
+# ----------------------------------------------------------------------
+def expected(notebook: dict, keep_tags=nbstrip.KEEP_TAGS, keep_output_types=()) -> dict:
+    """Strip a notebook with a plain JSON round trip."""
+    notebook = json.loads(json.dumps(notebook))
+    for cell in notebook['cells']:
+        if 'execution_count' in cell:
+            cell['execution_count'] = None
+        if 'outputs' in cell and not set(keep_tags) & set(cell['metadata'].get('tags', [])):
+            cell['outputs'] = [output for output in cell['outputs']
+                               if output['output_type'] in keep_output_types]
+    return notebook
+
+
+########################################################################
+class TestNotebookStripper(unittest.TestCase):
+    """Strip notebooks held in memory."""
+
+    # ----------------------------------------------------------------------
+    def tearDown(self) -> None:
+        """Restore the chunk size."""
+        nbstrip.CHUNK_SIZE = 1 << 16
+
+    # ----------------------------------------------------------------------
+    def strip(self, text: str, *args) -> str:
+        """Strip a notebook source."""
+        target = io.StringIO()
+        nbstrip.strip_notebook(io.StringIO(text), target, *args)
+        return target.getvalue()
+
+    # ----------------------------------------------------------------------
+    def test_strip(self) -> None:
+        self.assertEqual(self.strip(dumps(NOTEBOOK)), dumps(expected(NOTEBOOK)))
+
+    # ----------------------------------------------------------------------
+    def test_chunk_boundaries(self) -> None:
+        text = dumps(NOTEBOOK)
+        for size in (1, 2, 3, 5, 7):
+            nbstrip.CHUNK_SIZE = size
+            self.assertEqual(self.strip(text), dumps(expected(NOTEBOOK)), size)
+
+    # ----------------------------------------------------------------------
+    def test_repository_notebooks(self) -> None:
+        notebooks = [path for path in REPOSITORY.rglob('*.ipynb') if '.git' not in path.parts]
+        self.assertTrue(notebooks)
+        for size in (1, 1 << 16):
+            nbstrip.CHUNK_SIZE = size
+            for path in notebooks:
+                text = path.read_text(encoding='utf-8')
+                stripped = self.strip(text)
+                self.assertEqual(json.loads(stripped), expected(json.loads(text)), path)
+                self.assertEqual(self.strip(stripped), stripped, path)
+
+    # ----------------------------------------------------------------------
+    def test_keep_output_tag(self) -> None:
+        stripped = json.loads(self.strip(dumps(NOTEBOOK)))
+        self.assertEqual(stripped['cells'][2]['outputs'], NOTEBOOK['cells'][2]['outputs'])
+        self.assertIsNone(stripped['cells'][2]['execution_count'])
+
+        stripped = json.loads(self.strip(dumps(NOTEBOOK), ()))
+        self.assertEqual(stripped['cells'][2]['outputs'], [])
+
+    # ----------------------------------------------------------------------
+    def test_keep_output_types(self) -> None:
+        nbstrip.CHUNK_SIZE = 3
+        for types in (['stream'], ['display_data'], ['stream', 'display_data'], ['error']):
+            text = self.strip(dumps(NOTEBOOK), (), types)
+            self.assertEqual(text, dumps(expected(NOTEBOOK, (), types)), types)
+
+    # ----------------------------------------------------------------------
+    def test_metadata_outputs(self) -> None:
+        stripped = json.loads(self.strip(dumps(NOTEBOOK)))
+        self.assertEqual(stripped['metadata'], NOTEBOOK['metadata'])
+
+    # ----------------------------------------------------------------------
+    def test_empty(self) -> None:
+        self.assertEqual(self.strip(''), '')
+        self.assertEqual(self.strip('\n'), '\n')
+
+    # ----------------------------------------------------------------------
+    def test_malformed(self) -> None:
+        text = dumps(NOTEBOOK)
+        for source in (text[:len(text) // 2], '{"cells": [}', 'null'):
+            with self.assertRaises(ValueError):
+                self.strip(source)
+
+    # ----------------------------------------------------------------------
+    def test_main(self) -> None:
+        script = [sys.executable, nbstrip.__file__]
+        result = subprocess.run(script, input=dumps(NOTEBOOK)[:100].encode(), capture_output=True)
+        self.assertEqual(result.returncode, 1)
+        self.assertEqual(result.stderr.decode().count('\n'), 1)
+        self.assertTrue(result.stderr.startswith(b'nbstrip: '))
+
+        result = subprocess.run(script, input=dumps(NOTEBOOK).encode(), capture_output=True, check=True)
+        self.assertEqual(json.loads(result.stdout), expected(NOTEBOOK))
+
+
+########################################################################
+class TestGitIntegration(unittest.TestCase):
+    """Install the filter in a temporary repository."""
+
+    # ----------------------------------------------------------------------
+    def setUp(self) -> None:
+        """Create a repository with the filter installed."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        subprocess.run(['git', 'init', '-q'], cwd=self.root, check=True)
+        nbstrip.install_filter(self.root)
+
+    # ----------------------------------------------------------------------
+    def tearDown(self) -> None:
+        """Remove the repository."""
+        self.tmp.cleanup()
+
+    # ----------------------------------------------------------------------
+    def test_install_twice(self) -> None:
+        nbstrip.install_filter(self.root)
+        attributes = (self.root / '.git' / 'info' / 'attributes').read_text()
+        self.assertEqual(attributes, f'*.ipynb filter={nbstrip.FILTER_NAME}\n')
+
+    # ----------------------------------------------------------------------
+    def test_bytes_saved(self) -> None:
+        text = dumps(NOTEBOOK)
+        (self.root / 'notebook.ipynb').write_text(text, encoding='utf-8')
+        (self.root / 'empty.ipynb').write_text('')
+        subprocess.run(['git', 'add', '.'], cwd=self.root, check=True)
+
+        staged = subprocess.run(['git', 'show', ':notebook.ipynb'], cwd=self.root,
+                                stdout=subprocess.PIPE, check=True).stdout
+        self.assertEqual(staged.decode('utf-8'), dumps(expected(NOTEBOOK)))
+        self.assertEqual(nbstrip.bytes_saved(self.root), {
+            'notebook.ipynb': len(text.encode('utf-8')) - len(staged),
+            'empty.ipynb': 0,
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
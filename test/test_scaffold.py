@@ -0,0 +1,104 @@
+"""
+Tests for `gcpds.docs.scaffold`, rendering and writing a project scaffold.
+
+The module is imported from its directory, the `gcpds.docs` package imports the
+notebook widgets.
+"""
+
+import ast
+import sys
+import tempfile
+import unittest
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1] / 'gcpds' / 'docs'))
+import scaffold  # noqa: E402
+
+
+########################################################################
+class TestScaffold(unittest.TestCase):
+    """Render the scaffold of a project with quotes in its names."""
+
+    # ----------------------------------------------------------------------
+    def setUp(self) -> None:
+        """Create the scaffold and a temporary root."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.scaffold = scaffold.Scaffold('Jo\'s "Docs"', "Jo O'Neil", 'jo@example.org',
+                                          'gcpds', 'docs')
+
+    # ----------------------------------------------------------------------
+    def tearDown(self) -> None:
+        """Remove the temporary root."""
+        self.tmp.cleanup()
+
+    # ----------------------------------------------------------------------
+    def test_render(self) -> None:
+        for filename in scaffold.FILES:
+            self.assertTrue(self.scaffold.render(filename), filename)
+
+    # ----------------------------------------------------------------------
+    def test_python_literals(self) -> None:
+        setup = ast.parse(self.scaffold.render('setup.py'))
+        keywords = {keyword.arg: ast.literal_eval(keyword.value)
+                    for node in ast.walk(setup) if isinstance(node, ast.Call)
+                    for keyword in node.keywords if keyword.arg in ('name', 'author', 'packages')}
+        self.assertEqual(keywords, {'name': 'gcpds-docs', 'author': "Jo O'Neil",
+                                    'packages': ['gcpds', 'gcpds.docs']})
+
+        conf = ast.parse(self.scaffold.render('docs/source/conf.py'))
+        values = {node.targets[0].id: ast.literal_eval(node.value) for node in conf.body
+                  if isinstance(node, ast.Assign) and node.targets[0].id in ('project', 'author')}
+        self.assertEqual(values, {'project': 'Jo\'s "Docs"', 'author': "Jo O'Neil"})
+
+    # ----------------------------------------------------------------------
+    def test_index(self) -> None:
+        title, rule = self.scaffold.render('docs/source/index.rst').splitlines()[:2]
+        self.assertEqual(title, 'Jo\'s "Docs"')
+        self.assertEqual(rule, '=' * len(title))
+
+    # ----------------------------------------------------------------------
+    def test_verbatim(self) -> None:
+        makefile = (scaffold.TEMPLATES_DIR / scaffold.FILES['docs/Makefile']).read_text()
+        self.assertIn('$(SPHINXBUILD)', makefile)
+        self.assertEqual(self.scaffold.render('docs/Makefile'), makefile)
+
+    # ----------------------------------------------------------------------
+    def test_write(self) -> None:
+        status = self.scaffold.write(self.root)
+        self.assertEqual(status, dict.fromkeys(scaffold.FILES, 'created'))
+        contents = {filename: (self.root / filename).read_text() for filename in scaffold.FILES}
+
+        self.assertEqual(self.scaffold.write(self.root), dict.fromkeys(scaffold.FILES, 'unchanged'))
+        self.assertEqual(self.scaffold.write(self.root, overwrite=True),
+                         dict.fromkeys(scaffold.FILES, 'unchanged'))
+        self.assertEqual({filename: (self.root / filename).read_text() for filename in scaffold.FILES},
+                         contents)
+
+    # ----------------------------------------------------------------------
+    def test_existing(self) -> None:
+        (self.root / 'setup.py').write_text('# hand-written\n')
+        self.assertEqual(self.scaffold.write(self.root, only=['setup.py']), {'setup.py': 'skipped'})
+        self.assertEqual((self.root / 'setup.py').read_text(), '# hand-written\n')
+
+        status = self.scaffold.write(self.root, overwrite=True, only=['setup.py'])
+        self.assertEqual(status, {'setup.py': 'updated'})
+        self.assertEqual((self.root / 'setup.py').read_text(), self.scaffold.render('setup.py'))
+
+    # ----------------------------------------------------------------------
+    def test_from_repository(self) -> None:
+        subprocess.run(['git', 'init', '-q'], cwd=self.root, check=True)
+        with self.assertRaises(ValueError):
+            scaffold.Scaffold.from_repository(self.root, 'Jo', 'jo@example.org')
+
+        subprocess.run(['git', 'remote', 'add', 'origin', 'https://github.com/UN-GCPDS/python-gcpds.docs.git'],
+                       cwd=self.root, check=True)
+        project = scaffold.Scaffold.from_repository(self.root, 'Jo', 'jo@example.org')
+        self.assertEqual(project.parameters['project'], repr('GCPDS - Docs'))
+        self.assertEqual(project.parameters['name'], repr('gcpds-docs'))
+        self.assertEqual(project.parameters['source_path'], repr('../../gcpds'))
+
+
+if __name__ == '__main__':
+    unittest.main()